@@ -0,0 +1,255 @@
+"""Benchmark the CPU and disk scheduling engines across input sizes.
+
+Every CPU and disk algorithm runs over seeded synthetic workloads (see
+workload_generator) of each requested size. Each case records its best wall
+time over a few runs plus, in a separate run under tracemalloc, its peak
+traced memory and the number of memory blocks it allocated that are still
+alive afterwards (mostly its result). Runs are appended to a JSON Lines
+history and can be compared against a stored baseline run; the exit status
+is 1 if any case got slower or bigger than the tolerance allows.
+
+    python benchmark.py --sizes 1e2:1e5 --save-baseline baseline.json
+    python benchmark.py --sizes 1e2:1e5 --baseline baseline.json --tolerance 0.25
+    python benchmark.py -k cpu/RR/sparse --sizes 1e6
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from functools import partial
+
+import numpy as np
+
+from cli import CPU_ALGORITHMS, DISK_ALGORITHMS, run_cpu, run_disk
+from cpu_scheduler import CPUScheduler
+from disk_scheduler import DiskScheduler
+from workload_generator import disk_workload, load_processes
+
+DEFAULT_SIZES = (10**2, 10**3, 10**4, 10**5, 10**6)
+DISK_SIZE = 5000
+
+# Keyword arguments for workload_generator.process_chunks
+CPU_WORKLOADS = {
+    # Load ~1: the ready queue stays busy without running away
+    'poisson': dict(rate=0.1, mean_burst=10.0),
+    # One job in ten is ~20x longer, at the same load
+    'large-bursts': dict(rate=0.035, burst='bimodal', mean_burst=10.0, long_burst=200.0,
+                         long_fraction=0.1),
+    # Load ~0.1: the CPU is mostly idle and the engines skip long gaps
+    'sparse': dict(rate=0.01, mean_burst=10.0),
+}
+# Keyword arguments for workload_generator.disk_request_chunks
+DISK_WORKLOADS = {
+    'uniform': dict(pattern='uniform'),
+    'zipf': dict(pattern='zipf'),
+    'sequential': dict(pattern='sequential'),
+}
+
+METRICS = ('wall_time', 'peak_memory', 'retained_blocks')
+# Differences below these are noise, whatever the ratio
+NOISE_FLOORS = {'wall_time': 0.005, 'peak_memory': 64 * 1024, 'retained_blocks': 100}
+# Stop repeating a case once its runs add up to this many seconds
+MAX_CASE_SECONDS = 2.0
+
+
+def cases(sizes, seed=0, quantum=2, pattern=None):
+    """Yield (case id, info dict, run) for every algorithm, workload and size.
+
+    Only cases whose id contains ``pattern`` are yielded. ``run`` is a
+    callable that runs the case on a workload built up front; building the
+    workload is not part of the measurement.
+    """
+    for size in sizes:
+        for kind, workloads, algorithms in (('cpu', CPU_WORKLOADS, CPU_ALGORITHMS),
+                                            ('disk', DISK_WORKLOADS, DISK_ALGORITHMS)):
+            for workload, params in workloads.items():
+                selected = [(f"{kind}/{algorithm}/{workload}/{size}", algorithm)
+                            for algorithm in algorithms]
+                selected = [(case, a) for case, a in selected if not pattern or pattern in case]
+                if not selected:
+                    continue
+                if kind == 'cpu':
+                    scheduler = load_processes(CPUScheduler(), size, seed=seed, **params)
+                else:
+                    requests, head_start = disk_workload(size, DISK_SIZE, seed=seed, **params)
+                    scheduler = DiskScheduler()
+                    scheduler.set_requests(requests, head_start)
+                for case, algorithm in selected:
+                    if kind == 'cpu':
+                        run = partial(run_cpu, scheduler, algorithm, quantum)
+                    else:
+                        run = partial(run_disk, scheduler, algorithm, DISK_SIZE)
+                    yield case, dict(kind=kind, algorithm=algorithm, workload=workload,
+                                     size=size), run
+
+
+def measure(run, repeat=3):
+    """Best wall time of up to ``repeat`` runs, then peak memory and retained blocks of one more"""
+    best = None
+    spent = 0.0
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+        spent += elapsed
+        if spent > MAX_CASE_SECONDS:
+            break
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = run()
+        _, peak = tracemalloc.get_traced_memory()
+        # Only allocations made since start() are traced, so these are the
+        # blocks the run allocated and still holds, mostly in its result
+        blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics('filename'))
+    finally:
+        tracemalloc.stop()
+    del result
+    return {'wall_time': best, 'peak_memory': peak, 'retained_blocks': blocks}
+
+
+def _commit():
+    here = os.path.dirname(os.path.abspath(__file__))
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=here,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, pattern=None, seed=0, repeat=3, quantum=2, log=None):
+    """Run every case whose id contains ``pattern`` and return the run record"""
+    results = []
+    for case, info, run in cases(sizes, seed, quantum, pattern):
+        result = dict(case=case, **info, **measure(run, repeat))
+        results.append(result)
+        if log is not None:
+            log(result)
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': _commit(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'seed': seed,
+        'repeat': repeat,
+        'quantum': quantum,
+        'results': results,
+    }
+
+
+def load_run(path):
+    """Read a run record: a single JSON object, or the last line of a history file"""
+    with open(path) as f:
+        lines = [line for line in f if line.strip()]
+    if not lines:
+        raise ValueError(f"{path}: no benchmark run found")
+    return json.loads(lines[-1])
+
+
+def compare(run, baseline, tolerance=0.1):
+    """Cases of ``run`` that are worse than ``baseline`` by more than ``tolerance``.
+
+    Returns ``(case, metric, baseline value, new value)`` tuples. A metric
+    regresses when it grows by more than the tolerance (a fraction) and by
+    more than its noise floor. Cases missing from either run are skipped.
+    """
+    old = {result['case']: result for result in baseline['results']}
+    regressions = []
+    for result in run['results']:
+        previous = old.get(result['case'])
+        if previous is None:
+            continue
+        for metric in METRICS:
+            before, after = previous.get(metric), result.get(metric)
+            if before is None or after is None:
+                continue
+            if after > before * (1 + tolerance) and after - before > NOISE_FLOORS[metric]:
+                regressions.append((result['case'], metric, before, after))
+    return regressions
+
+
+def _size_list(value):
+    """Parse '1e2,1e4' or 'start:stop' powers of ten ('1e2:1e5')"""
+    sizes = []
+    for part in value.split(','):
+        if ':' in part:
+            low, high = (int(float(x)) for x in part.split(':'))
+            size = low
+            while size <= high:
+                sizes.append(size)
+                size *= 10
+        elif part.strip():
+            sizes.append(int(float(part)))
+    if not sizes or min(sizes) <= 0:
+        raise argparse.ArgumentTypeError("sizes must be positive")
+    return sizes
+
+
+def _format_result(result):
+    return (f"{result['case']:<36} {result['wall_time'] * 1000:10.2f} ms "
+            f"{result['peak_memory'] / 2**20:9.2f} MiB {result['retained_blocks']:>10} retained")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=_size_list, default=list(DEFAULT_SIZES),
+                        help="workload sizes, e.g. '1e2,1e3' or '1e2:1e6' (default: 1e2:1e6)")
+    parser.add_argument('-k', '--filter', metavar='PATTERN',
+                        help="only run cases whose id (kind/algorithm/workload/size) contains this")
+    parser.add_argument('--seed', type=int, default=0, help="workload seed (default: 0)")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="timed runs per case, best one counts (default: 3)")
+    parser.add_argument('-q', '--quantum', type=int, default=2,
+                        help="Round Robin time quantum (default: 2)")
+    parser.add_argument('--history', default='bench_history.jsonl',
+                        help="JSON Lines file the run is appended to (default: bench_history.jsonl)")
+    parser.add_argument('--no-history', action='store_true', help="do not append to the history")
+    parser.add_argument('--save-baseline', metavar='FILE', help="also write this run to FILE")
+    parser.add_argument('--baseline', metavar='FILE',
+                        help="compare against this run (a saved baseline or the last run of a history)")
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help="allowed relative growth of each metric (default: 0.1)")
+    args = parser.parse_args(argv)
+
+    try:
+        baseline = load_run(args.baseline) if args.baseline else None
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+    run = run_benchmarks(args.sizes, args.filter, args.seed, args.repeat, args.quantum,
+                         log=lambda result: print(_format_result(result), flush=True))
+    line = json.dumps(run) + '\n'
+    if not args.no_history:
+        with open(args.history, 'a') as f:
+            f.write(line)
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            f.write(line)
+
+    if baseline is None:
+        return 0
+    regressions = compare(run, baseline, args.tolerance)
+    for case, metric, before, after in regressions:
+        change = f" ({after / before - 1:+.1%})" if before else ""
+        print(f"REGRESSION {case} {metric}: {before:.6g} -> {after:.6g}{change}")
+    if regressions:
+        print(f"FAIL: {len(regressions)} regressions over {args.tolerance:.0%} "
+              f"(baseline {baseline.get('commit')} from {baseline.get('timestamp')})")
+        return 1
+    print(f"OK: no regressions over {args.tolerance:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
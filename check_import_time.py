@@ -0,0 +1,151 @@
+"""Check the import-time and cold-start budgets of the engines and cli.py.
+
+Runs ``python -X importtime`` in a fresh interpreter, reports the cumulative
+import time of each engine module and fails if the total goes over budget or
+if any plotting/GUI module was pulled in along the way.
+
+It then times ``cli.py cpu`` and ``cli.py disk`` end to end on a tiny
+workload, next to a bare interpreter and one that only imports NumPy. The
+CLI's own share is its time beyond the NumPy-only run, and has to stay
+within ``--cli-budget-ms``. The end-to-end time is reported but not
+budgeted: the interpreter and NumPy alone can take well over 100 ms.
+
+NumPy is a hard dependency of the CPU engine's process table and takes about
+as long to import as the whole budget on a slow machine, so its share is
+reported on its own line and left out of the budgeted total. Modules listed
+in NUMPY_FREE_MODULES must not import NumPy at all, and neither may setting
+up a DiskScheduler: it only needs NumPy once an algorithm runs.
+
+    python check_import_time.py [--budget-ms 100] [--cli-budget-ms 100] [--runs 5]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ENGINE_MODULES = ('cpu_scheduler', 'disk_scheduler', 'utils')
+# These load NumPy on first use, not at import
+NUMPY_FREE_MODULES = ('disk_scheduler', 'utils')
+FORBIDDEN_PREFIXES = ('matplotlib', 'tkinter', '_tkinter', 'PIL')
+# Exits with status 1 if NumPy got loaded
+NUMPY_FREE_SETUP = f"""
+import sys
+import {', '.join(NUMPY_FREE_MODULES)}
+scheduler = disk_scheduler.DiskScheduler()
+scheduler.set_requests([98, 183, 37, 122], 53)
+sys.exit('numpy' in sys.modules)
+"""
+
+
+def measure_imports(modules=ENGINE_MODULES):
+    """Return ({module: cumulative_us}, [all imported module names]) for one run.
+
+    NumPy's cumulative time is included under 'numpy' if it was imported.
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import ' + ', '.join(modules)],
+        cwd=here, capture_output=True, text=True, check=True)
+
+    cumulative = {}
+    imported = []
+    for line in result.stderr.splitlines():
+        # "import time:   self [us] |  cumulative | imported package"
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        parts = line[len('import time:'):].split('|')
+        name = parts[2].strip()
+        imported.append(name)
+        if name in modules or name == 'numpy':
+            cumulative[name] = int(parts[1])
+    return cumulative, imported
+
+
+def time_command(args, runs=5, cwd=None):
+    """Best wall time in ms of ``python *args`` in a fresh interpreter"""
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], cwd=cwd, stdout=subprocess.DEVNULL, check=True)
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def measure_cli(runs=5):
+    """Return {label: best ms} for a bare interpreter, NumPy alone and both cli.py modes"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    with tempfile.TemporaryDirectory() as tmp:
+        cpu_path = os.path.join(tmp, 'jobs.txt')
+        disk_path = os.path.join(tmp, 'trace.txt')
+        with open(cpu_path, 'w') as f:
+            f.write("P1 0 5 1\nP2 1 3 0\nP3 2 8 2\n")
+        with open(disk_path, 'w') as f:
+            f.write("98 183 37 122 14 124 65 67\n")
+        commands = {
+            'python -c pass': ['-c', 'pass'],
+            'import numpy': ['-c', 'import numpy'],
+            'cli.py cpu': ['cli.py', 'cpu', cpu_path, '-a', 'all'],
+            'cli.py disk': ['cli.py', 'disk', disk_path, '--head', '53', '-a', 'all'],
+        }
+        return {label: time_command(args, runs, here) for label, args in commands.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--budget-ms', type=float, default=100.0,
+                        help="max total import time of the engines, NumPy excluded (default: 100)")
+    parser.add_argument('--cli-budget-ms', type=float, default=100.0,
+                        help="max cli.py cold start beyond importing NumPy (default: 100)")
+    parser.add_argument('--runs', type=int, default=5,
+                        help="take the best of this many runs (default: 5)")
+    args = parser.parse_args(argv)
+
+    def own_time(cumulative):
+        # The first engine to import NumPy carries its whole import time
+        return sum(cumulative.get(name, 0) for name in ENGINE_MODULES) - cumulative.get('numpy', 0)
+
+    best = None
+    for _ in range(args.runs):
+        cumulative, imported = measure_imports()
+        if best is None or own_time(cumulative) < own_time(best):
+            best = cumulative
+
+    for name in ENGINE_MODULES:
+        print(f"{name:<16} {best.get(name, 0) / 1000:8.1f} ms")
+    print(f"{'numpy (excluded)':<16} {best.get('numpy', 0) / 1000:8.1f} ms")
+    total_ms = own_time(best) / 1000
+    print(f"{'total w/o numpy':<16} {total_ms:8.1f} ms (budget {args.budget_ms:.0f} ms)")
+
+    forbidden = sorted(name for name in imported
+                       if name.split('.')[0] in FORBIDDEN_PREFIXES)
+    if forbidden:
+        print(f"FAIL: plotting/GUI modules imported: {', '.join(forbidden[:5])}")
+        return 1
+    here = os.path.dirname(os.path.abspath(__file__))
+    if subprocess.run([sys.executable, '-c', NUMPY_FREE_SETUP], cwd=here).returncode:
+        print(f"FAIL: importing {', '.join(NUMPY_FREE_MODULES)} or setting up a "
+              f"DiskScheduler imports numpy")
+        return 1
+    if total_ms > args.budget_ms:
+        print("FAIL: import time over budget")
+        return 1
+
+    cold = measure_cli(args.runs)
+    print()
+    for label, ms in cold.items():
+        print(f"{label:<16} {ms:8.1f} ms")
+    for label in ('cli.py cpu', 'cli.py disk'):
+        own_ms = cold[label] - cold['import numpy']
+        print(f"{label + ' own':<16} {own_ms:8.1f} ms (budget {args.cli_budget_ms:.0f} ms)")
+        if own_ms > args.cli_budget_ms:
+            print(f"FAIL: {label} cold start over budget")
+            return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,254 @@
+"""Headless batch runner for the CPU and disk schedulers.
+
+Reads workload files, runs one or more algorithms on each and writes the
+Gantt segments / head sequence and metrics as JSON Lines or CSV. Only the
+standard library and the scheduler engines are imported, never tkinter or
+matplotlib, so it starts quickly enough to be called from scripts.
+
+CPU workloads use the Quick Import format, one process per line:
+    Name Arrival Burst [Priority]
+Disk workloads are whitespace separated cylinder numbers. Blank lines and
+lines starting with '#' are ignored in both.
+
+With --trace the CPU engines' events (arrivals, dispatches, preemptions,
+completions, idle gaps and ready-queue sizes) are also written as a Chrome
+trace-event file, which chrome://tracing or https://ui.perfetto.dev can open.
+
+Examples:
+    python cli.py cpu jobs.txt -a SJF,RR -q 4 -f csv -o out.csv
+    python cli.py cpu jobs.txt -a all --trace trace.json -s
+    python cli.py disk trace.txt --head 53 -a all
+"""
+import argparse
+import csv
+import json
+import sys
+
+CPU_ALGORITHMS = ('FCFS', 'SJF', 'SRTF', 'RR', 'PRIORITY', 'PRIORITY_P', 'MLFQ', 'CFS')
+DISK_ALGORITHMS = ('FCFS', 'SSTF', 'SCAN', 'CSCAN', 'LOOK', 'CLOOK', 'NSTEP', 'FSCAN')
+
+CPU_FIELDS = ('record', 'workload', 'algorithm', 'process', 'start', 'end',
+              'arrival_time', 'burst_time', 'priority', 'completion_time',
+              'turnaround_time', 'waiting_time', 'response_time', 'context_switches',
+              'overhead_fraction', 'effective_utilization', 'throughput')
+DISK_FIELDS = ('record', 'workload', 'algorithm', 'step', 'cylinder',
+               'seek_time', 'requests', 'max_bypassed')
+
+
+def _content_lines(path):
+    with open(path) as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if line and not line.startswith('#'):
+                yield line_no, line
+
+
+def read_cpu_workload(path):
+    """Yield (name, arrival, burst, priority) tuples from a workload file"""
+    for line_no, line in _content_lines(path):
+        parts = line.replace(',', ' ').split()
+        try:
+            if len(parts) < 3:
+                raise ValueError("expected: Name Arrival Burst [Priority]")
+            priority = int(parts[3]) if len(parts) > 3 else 0
+            yield parts[0], int(parts[1]), int(parts[2]), priority
+        except ValueError as e:
+            raise ValueError(f"{path}:{line_no}: {e}") from None
+
+
+def read_disk_workload(path):
+    """Return the list of cylinder requests in a workload file"""
+    requests = []
+    for line_no, line in _content_lines(path):
+        try:
+            requests.extend(int(x) for x in line.replace(',', ' ').split())
+        except ValueError as e:
+            raise ValueError(f"{path}:{line_no}: {e}") from None
+    return requests
+
+
+def run_cpu(scheduler, algorithm, quantum=2):
+    if algorithm == "FCFS":
+        return scheduler.fcfs()
+    elif algorithm == "SJF":
+        return scheduler.sjf()
+    elif algorithm == "SRTF":
+        return scheduler.srtf()
+    elif algorithm == "RR":
+        return scheduler.round_robin(quantum)
+    elif algorithm == "PRIORITY":
+        return scheduler.priority_scheduling()
+    elif algorithm == "PRIORITY_P":
+        return scheduler.priority_preemptive()
+    elif algorithm == "MLFQ":
+        return scheduler.mlfq(time_quantum=quantum)
+    elif algorithm == "CFS":
+        return scheduler.cfs()
+    raise ValueError(f"Unknown CPU algorithm: {algorithm}")
+
+
+def run_disk(scheduler, algorithm, disk_size=200, step=10):
+    if algorithm == "FCFS":
+        return scheduler.fcfs()
+    elif algorithm == "SSTF":
+        return scheduler.sstf()
+    elif algorithm == "SCAN":
+        return scheduler.scan(disk_size)
+    elif algorithm == "CSCAN":
+        return scheduler.c_scan(disk_size)
+    elif algorithm == "LOOK":
+        return scheduler.look()
+    elif algorithm == "CLOOK":
+        return scheduler.c_look()
+    elif algorithm == "NSTEP":
+        return scheduler.n_step_scan(disk_size, step)
+    elif algorithm == "FSCAN":
+        return scheduler.fscan(disk_size)
+    raise ValueError(f"Unknown disk algorithm: {algorithm}")
+
+
+def cpu_records(args, tracer=None):
+    from cpu_scheduler import CPUScheduler
+
+    scheduler = CPUScheduler(switch_cost=args.switch_cost, tracer=tracer)
+    for path in args.workloads:
+        if tracer is not None:
+            tracer.prefix = f"{path}: "
+        scheduler.processes.clear()
+        for name, arrival, burst, priority in read_cpu_workload(path):
+            scheduler.add_process(name, arrival, burst, priority)
+
+        for algorithm in args.algorithms:
+            gantt_chart = run_cpu(scheduler, algorithm, args.quantum)
+            metrics = scheduler.calculate_metrics(gantt_chart, aggregate_only=args.summary_only)
+            base = {'workload': path, 'algorithm': algorithm}
+
+            if not args.summary_only:
+                for name, start, end in gantt_chart:
+                    yield dict(record='segment', **base, process=name, start=start, end=end)
+                for name, data in metrics.items():
+                    if name not in ('_averages', '_summary', '_cpu'):
+                        yield dict(record='process', **base, process=name, **data)
+
+            averages = metrics.get('_averages', {})
+            usage = metrics.get('_cpu', {})
+            yield dict(record='summary', **base,
+                       turnaround_time=averages.get('avg_turnaround_time'),
+                       waiting_time=averages.get('avg_waiting_time'),
+                       response_time=averages.get('avg_response_time'),
+                       context_switches=usage.get('context_switches'),
+                       overhead_fraction=usage.get('overhead_fraction'),
+                       effective_utilization=usage.get('effective_utilization'),
+                       throughput=usage.get('throughput'))
+
+
+def disk_records(args):
+    from disk_scheduler import DiskScheduler
+
+    scheduler = DiskScheduler()
+    for path in args.workloads:
+        requests = read_disk_workload(path)
+        scheduler.set_requests(requests, args.head)
+
+        for algorithm in args.algorithms:
+            sequence = run_disk(scheduler, algorithm, args.disk_size, args.step)
+            base = {'workload': path, 'algorithm': algorithm}
+
+            if not args.summary_only:
+                for step, cylinder in enumerate(sequence):
+                    yield dict(record='step', **base, step=step, cylinder=cylinder)
+
+            yield dict(record='summary', **base, requests=len(requests),
+                       seek_time=scheduler.calculate_seek_time(sequence),
+                       max_bypassed=scheduler.max_bypassed)
+
+
+def write_jsonl(records, out):
+    dumps = json.dumps
+    for record in records:
+        out.write(dumps(record))
+        out.write('\n')
+
+
+def write_csv(records, out, fields):
+    writer = csv.DictWriter(out, fieldnames=fields, extrasaction='ignore')
+    writer.writeheader()
+    writer.writerows(records)
+
+
+def algorithm_list(value, choices):
+    if value.lower() == 'all':
+        return list(choices)
+    algorithms = [a.strip().upper() for a in value.split(',') if a.strip()]
+    for algorithm in algorithms:
+        if algorithm not in choices:
+            raise argparse.ArgumentTypeError(
+                f"unknown algorithm {algorithm!r} (choose from {', '.join(choices)} or 'all')")
+    return algorithms
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Run CPU or disk scheduling algorithms without the GUI.")
+    sub = parser.add_subparsers(dest='mode', required=True)
+
+    cpu = sub.add_parser('cpu', help="CPU scheduling")
+    cpu.add_argument('-a', '--algorithms', default='FCFS',
+                     type=lambda v: algorithm_list(v, CPU_ALGORITHMS),
+                     help=f"comma separated list of {', '.join(CPU_ALGORITHMS)} or 'all'")
+    cpu.add_argument('-q', '--quantum', type=int, default=2,
+                     help="Round Robin time quantum, also MLFQ's level-0 quantum (default: 2)")
+    cpu.add_argument('--switch-cost', type=int, default=0,
+                     help="time units lost on every context switch (default: 0)")
+    cpu.add_argument('--trace', metavar='FILE',
+                     help="also write the engines' events to FILE as a Chrome trace")
+
+    disk = sub.add_parser('disk', help="disk scheduling")
+    disk.add_argument('-a', '--algorithms', default='FCFS',
+                      type=lambda v: algorithm_list(v, DISK_ALGORITHMS),
+                      help=f"comma separated list of {', '.join(DISK_ALGORITHMS)} or 'all'")
+    disk.add_argument('--head', type=int, required=True, help="head start position")
+    disk.add_argument('--disk-size', type=int, default=200,
+                      help="number of cylinders (default: 200)")
+    disk.add_argument('--step', type=int, default=10,
+                      help="group size for N-step SCAN (default: 10)")
+
+    for p in (cpu, disk):
+        p.add_argument('workloads', nargs='+', metavar='WORKLOAD', help="workload file")
+        p.add_argument('-f', '--format', choices=('jsonl', 'csv'), default='jsonl')
+        p.add_argument('-o', '--output', help="output file (default: stdout)")
+        p.add_argument('-s', '--summary-only', action='store_true',
+                       help="only write one summary record per workload and algorithm")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    tracer = None
+    if args.mode == 'cpu':
+        if args.trace:
+            from tracing import Tracer
+            tracer = Tracer()
+        records, fields = cpu_records(args, tracer), CPU_FIELDS
+    else:
+        records, fields = disk_records(args), DISK_FIELDS
+
+    out = open(args.output, 'w', newline='') if args.output else sys.stdout
+    try:
+        if args.format == 'csv':
+            write_csv(records, out, fields)
+        else:
+            write_jsonl(records, out)
+        if tracer is not None:
+            tracer.write_chrome_trace(args.trace)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
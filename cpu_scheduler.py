@@ -1,32 +1,79 @@
+import bisect
+import heapq
+import logging
+from collections import deque
+
+import numpy as np
+
+from gantt import OVERHEAD, OVERHEAD_NAME, GanttChart
+from process_table import ProcessTable
+
+_logger = logging.getLogger(__name__)
+
+# Linux's sched_prio_to_weight: load weight of nice -20..19, each step ~1.25x
+NICE_TO_WEIGHT = (
+    88761, 71755, 56483, 46273, 36291,
+    29154, 23254, 18705, 14949, 11916,
+    9548, 7620, 6100, 4904, 3906,
+    3121, 2501, 1991, 1586, 1277,
+    1024, 820, 655, 526, 423,
+    335, 272, 215, 172, 137,
+    110, 87, 70, 56, 45,
+    36, 29, 23, 18, 15,
+)
+NICE_0_WEIGHT = 1024
+
 class CPUScheduler:
-    def __init__(self):
-        self.processes = []
+    """Single-CPU scheduling over a ProcessTable.
+    
+    Switching the CPU to a different process costs ``switch_cost`` time
+    units (0 by default). The single-core engines show that time as
+    OVERHEAD segments in their Gantt charts, and a process that has just
+    been switched in runs until the next scheduling event before it can
+    be preempted.
+    
+    Setting ``tracer`` to a tracing.Tracer makes the single-core engines
+    report their arrive/dispatch/preempt/complete/idle events and ready-set
+    sizes to it.
+    """
+    
+    def __init__(self, switch_cost=0, tracer=None):
+        self.processes = ProcessTable()
+        self.level_stats = []
+        self.switch_cost = switch_cost
+        self.tracer = tracer
+    
+    @property
+    def switch_cost(self):
+        """Time units charged for every context switch"""
+        return self._switch_cost
+    
+    @switch_cost.setter
+    def switch_cost(self, value):
+        if value < 0:
+            raise ValueError("switch_cost must not be negative")
+        self._switch_cost = value
     
     def add_process(self, name, arrival_time, burst_time, priority=0):
-        self.processes.append({
-            'name': name,
-            'arrival_time': arrival_time,
-            'burst_time': burst_time,
-            'remaining_time': burst_time,
-            'priority': priority,
-            'start_time': -1,
-            'completion_time': -1,
-            'first_execution': -1
-        })
+        self.processes.append(name, arrival_time, burst_time, priority)
+    
+    def add_processes(self, names, arrival_times, burst_times, priorities=None):
+        """Bulk version of add_process taking parallel sequences or arrays"""
+        self.processes.extend(names, arrival_times, burst_times, priorities)
     
     def reset_processes(self):
-        for process in self.processes:
-            process['remaining_time'] = process['burst_time']
-            process['start_time'] = -1
-            process['completion_time'] = -1
-            process['first_execution'] = -1
+        table = self.processes
+        table.column('remaining_time')[:] = table.column('burst_time')
+        table.column('start_time')[:] = -1
+        table.column('completion_time')[:] = -1
+        table.column('first_execution')[:] = -1
     
     def get_process_by_name(self, name):
-        """Get the original process object by name"""
-        for process in self.processes:
-            if process['name'] == name:
-                return process
-        return None
+        """Get the original process (as a row view) by name"""
+        i = self.processes.index_of(name)
+        if i == -1:
+            return None
+        return self.processes[i]
     
     def update_process_state(self, name, **kwargs):
         """Update the state of the original process"""
@@ -35,345 +82,786 @@ class CPUScheduler:
             for key, value in kwargs.items():
                 process[key] = value
     
+    def _arrival_order(self, arrival):
+        # Stable, so equal arrivals keep insertion order
+        return sorted(range(len(arrival)), key=arrival.__getitem__)
+    
+    def _store_schedule(self, start, completion):
+        """Write per-process start/completion lists back into the table"""
+        table = self.processes
+        table.column('start_time')[:] = start
+        table.column('first_execution')[:] = start
+        table.column('completion_time')[:] = completion
+        table.column('remaining_time')[:] = 0
+    
+    def _switch(self, gantt_chart, previous, process, time):
+        """Charge a context switch from ``previous`` to ``process`` at ``time``.
+        
+        Returns the time the switch is done; nothing is charged when the
+        same process keeps the CPU or no process has run yet.
+        """
+        if not self.switch_cost or previous is None or previous == process:
+            return time
+        gantt_chart.append(OVERHEAD, time, time + self.switch_cost)
+        return time + self.switch_cost
+    
     def fcfs(self):
         if not self.processes:
-            return []
+            return GanttChart([])
         
         self.reset_processes()
-        # Sort by arrival time
-        sorted_processes = sorted(self.processes, key=lambda x: x['arrival_time'])
+        table = self.processes
+        names = table.names
+        arrival = table.column('arrival_time').tolist()
+        burst = table.column('burst_time').tolist()
+        n = len(arrival)
+        start = [-1] * n
+        completion = [-1] * n
         
-        gantt_chart = []
+        gantt_chart = GanttChart(names)
         current_time = 0
+        previous = None
+        trace = self.tracer
+        if trace is not None:
+            trace.begin('FCFS', names)
+            arrivals = sorted(arrival)
         
-        for process in sorted_processes:
-            if current_time < process['arrival_time']:
-                current_time = process['arrival_time']
-            
+        # Sort by arrival time
+        for started, i in enumerate(self._arrival_order(arrival)):
+            if current_time < arrival[i]:
+                if trace is not None:
+                    trace.idle(current_time, arrival[i])
+                current_time = arrival[i]
+            
+            current_time = self._switch(gantt_chart, previous, i, current_time)
+            previous = i
             start_time = current_time
-            end_time = current_time + process['burst_time']
-            gantt_chart.append((process['name'], start_time, end_time))
+            end_time = current_time + burst[i]
+            gantt_chart.append(i, start_time, end_time)
+            if trace is not None:
+                trace.arrive(arrival[i], i)
+                # Everyone else that has arrived by now is waiting
+                trace.sample(start_time, bisect.bisect_right(arrivals, start_time) - started - 1)
+                trace.dispatch(start_time, i)
+                trace.complete(end_time, i)
             current_time = end_time
-            
-            # Update the original process
-            self.update_process_state(process['name'], 
-                                    start_time=start_time,
-                                    completion_time=end_time,
-                                    first_execution=start_time)
+            start[i] = start_time
+            completion[i] = end_time
         
+        self._store_schedule(start, completion)
         return gantt_chart
     
     def sjf(self):
         if not self.processes:
-            return []
+            return GanttChart([])
         
-        self.reset_processes()
-        # Work with original processes, not copies
-        current_time = 0
-        completed = 0
-        n = len(self.processes)
-        gantt_chart = []
-        
-        while completed < n:
-            # Get available processes that haven't completed
-            available = [p for p in self.processes 
-                        if p['arrival_time'] <= current_time and p['remaining_time'] > 0]
-            
-            if not available:
-                current_time += 1
-                continue
-            
-            # Select process with shortest burst time
-            next_process = min(available, key=lambda x: x['burst_time'])
-            
-            start_time = current_time
-            end_time = current_time + next_process['burst_time']
-            gantt_chart.append((next_process['name'], start_time, end_time))
-            
-            current_time = end_time
-            next_process['remaining_time'] = 0
-            next_process['start_time'] = start_time
-            next_process['completion_time'] = end_time
-            next_process['first_execution'] = start_time
-            completed += 1
-        
-        return gantt_chart
+        # Select process with shortest burst time
+        return self._non_preemptive_schedule('burst_time')
     
     def srtf(self):
         if not self.processes:
-            return []
-        
-        self.reset_processes()
-        current_time = 0
-        completed = 0
-        n = len(self.processes)
-        gantt_chart = []
-        current_process = None
-        last_time = 0
+            return GanttChart([])
         
-        while completed < n:
-            # Get available processes
-            available = [p for p in self.processes 
-                        if p['arrival_time'] <= current_time and p['remaining_time'] > 0]
-            
-            if not available:
-                if current_process:
-                    # End the current process segment
-                    gantt_chart.append((current_process['name'], last_time, current_time))
-                    current_process = None
-                current_time += 1
-                continue
-            
-            # Select process with shortest remaining time
-            next_process = min(available, key=lambda x: x['remaining_time'])
-            
-            if current_process != next_process:
-                if current_process is not None and current_process['remaining_time'] > 0:
-                    # Add previous process to gantt chart
-                    gantt_chart.append((current_process['name'], last_time, current_time))
-                
-                current_process = next_process
-                last_time = current_time
-                
-                if current_process['first_execution'] == -1:
-                    current_process['first_execution'] = current_time
-                if current_process['start_time'] == -1:
-                    current_process['start_time'] = current_time
-            
-            # Execute for 1 time unit
-            current_time += 1
-            current_process['remaining_time'] -= 1
-            
-            if current_process['remaining_time'] == 0:
-                gantt_chart.append((current_process['name'], last_time, current_time))
-                current_process['completion_time'] = current_time
-                completed += 1
-                current_process = None
-        
-        return gantt_chart
+        return self._preemptive_schedule('remaining_time')
     
     def round_robin(self, time_quantum=2):
         if not self.processes:
-            return []
+            return GanttChart([])
         
         self.reset_processes()
-        current_time = 0
-        queue = []
-        n = len(self.processes)
+        table = self.processes
+        names = table.names
+        arrival = table.column('arrival_time').tolist()
+        remaining = table.column('burst_time').tolist()
+        n = len(arrival)
+        start = [-1] * n
+        completion = [-1] * n
+        # Sort by arrival time initially; the cursor admits each process exactly once
+        order = self._arrival_order(arrival)
+        next_arrival = 0
+        queue = deque()
         completed = 0
-        gantt_chart = []
-        
-        # Sort by arrival time initially
-        sorted_processes = sorted(self.processes, key=lambda x: x['arrival_time'])
+        current_time = 0
+        previous = None
+        gantt_chart = GanttChart(names)
+        trace = self.tracer
+        if trace is not None:
+            trace.begin(f'RR (quantum={time_quantum})', names)
         
         while completed < n:
             # Add arriving processes to queue
-            for p in sorted_processes:
-                if (p['arrival_time'] <= current_time and 
-                    p not in queue and p['remaining_time'] > 0):
-                    queue.append(p)
+            while next_arrival < n and arrival[order[next_arrival]] <= current_time:
+                queue.append(order[next_arrival])
+                if trace is not None:
+                    trace.arrive(arrival[order[next_arrival]], order[next_arrival])
+                next_arrival += 1
+            if trace is not None:
+                trace.sample(current_time, len(queue))
             
             if not queue:
-                current_time += 1
+                # CPU is idle, skip straight to the next arrival
+                if trace is not None:
+                    trace.idle(current_time, arrival[order[next_arrival]])
+                current_time = arrival[order[next_arrival]]
                 continue
             
-            current_process = queue.pop(0)
-            
-            if current_process['first_execution'] == -1:
-                current_process['first_execution'] = current_time
-            if current_process['start_time'] == -1:
-                current_process['start_time'] = current_time
+            i = queue.popleft()
+            current_time = self._switch(gantt_chart, previous, i, current_time)
+            previous = i
+            if start[i] == -1:
+                start[i] = current_time
             
             start_time = current_time
+            if trace is not None:
+                trace.dispatch(start_time, i)
             
-            if current_process['remaining_time'] <= time_quantum:
+            if remaining[i] <= time_quantum:
                 # Process completes
-                execution_time = current_process['remaining_time']
-                end_time = current_time + execution_time
-                gantt_chart.append((current_process['name'], start_time, end_time))
+                end_time = current_time + remaining[i]
+                gantt_chart.append(i, start_time, end_time)
                 current_time = end_time
-                current_process['remaining_time'] = 0
-                current_process['completion_time'] = end_time
+                remaining[i] = 0
+                completion[i] = end_time
                 completed += 1
+                if trace is not None:
+                    trace.complete(end_time, i)
             else:
                 # Process uses full quantum
                 end_time = current_time + time_quantum
-                gantt_chart.append((current_process['name'], start_time, end_time))
+                gantt_chart.append(i, start_time, end_time)
                 current_time = end_time
-                current_process['remaining_time'] -= time_quantum
+                remaining[i] -= time_quantum
+                if trace is not None:
+                    trace.preempt(end_time, i)
                 
-                # Add arriving processes during this execution
-                for p in sorted_processes:
-                    if (p['arrival_time'] <= current_time and 
-                        p not in queue and p['remaining_time'] > 0 and p != current_process):
-                        queue.append(p)
+                # Processes arriving during this quantum queue ahead of it
+                while next_arrival < n and arrival[order[next_arrival]] <= current_time:
+                    queue.append(order[next_arrival])
+                    if trace is not None:
+                        trace.arrive(arrival[order[next_arrival]], order[next_arrival])
+                    next_arrival += 1
                 
-                # Add back to queue if not finished
-                if current_process['remaining_time'] > 0:
-                    queue.append(current_process)
+                queue.append(i)
         
+        self._store_schedule(start, completion)
         return gantt_chart
     
     def priority_scheduling(self):
         if not self.processes:
-            return []
+            return GanttChart([])
+        
+        # Select process with highest priority (lowest number = highest priority)
+        return self._non_preemptive_schedule('priority')
+    
+    def priority_preemptive(self):
+        if not self.processes:
+            return GanttChart([])
+        
+        # Highest priority (lowest number) first
+        return self._preemptive_schedule('priority')
+    
+    def _non_preemptive_schedule(self, key):
+        """Run-to-completion scheduling on the process column ``key``.
+
+        Arrivals are admitted through a cursor over the arrival-sorted
+        processes into a ready heap keyed by ``(key, index)``. When nothing
+        is ready the clock jumps straight to the next arrival.
+        """
+        self.reset_processes()
+        table = self.processes
+        names = table.names
+        arrival = table.column('arrival_time').tolist()
+        burst = table.column('burst_time').tolist()
+        keys = table.column(key).tolist()
+        n = len(arrival)
+        start = [-1] * n
+        completion = [-1] * n
+        order = self._arrival_order(arrival)
+        next_arrival = 0
+        ready = []
+        gantt_chart = GanttChart(names)
+        current_time = 0
+        previous = None
+        trace = self.tracer
+        if trace is not None:
+            trace.begin('SJF' if key == 'burst_time' else 'Priority', names)
+        
+        for _ in range(n):
+            if not ready and arrival[order[next_arrival]] > current_time:
+                # CPU is idle, skip straight to the next arrival
+                if trace is not None:
+                    trace.idle(current_time, arrival[order[next_arrival]])
+                current_time = arrival[order[next_arrival]]
+            
+            while next_arrival < n and arrival[order[next_arrival]] <= current_time:
+                i = order[next_arrival]
+                heapq.heappush(ready, (keys[i], i))
+                if trace is not None:
+                    trace.arrive(arrival[i], i)
+                next_arrival += 1
+            if trace is not None:
+                trace.sample(current_time, len(ready))
+            
+            i = heapq.heappop(ready)[1]
+            current_time = self._switch(gantt_chart, previous, i, current_time)
+            previous = i
+            start_time = current_time
+            end_time = current_time + burst[i]
+            gantt_chart.append(i, start_time, end_time)
+            if trace is not None:
+                trace.dispatch(start_time, i)
+                trace.complete(end_time, i)
+            
+            current_time = end_time
+            start[i] = start_time
+            completion[i] = end_time
         
+        self._store_schedule(start, completion)
+        return gantt_chart
+    
+    def _preemptive_schedule(self, key):
+        """Event-driven preemptive scheduling on the process column ``key``.
+
+        The clock jumps from one arrival or completion to the next instead of
+        ticking one unit at a time, and the ready set is a heap keyed by
+        ``(key, index)`` so ties go to the process added first.
+        """
         self.reset_processes()
+        table = self.processes
+        names = table.names
+        arrival = table.column('arrival_time').tolist()
+        remaining = table.column('burst_time').tolist()
+        # SRTF keys on the live remaining times, priority on a fixed column
+        keys = remaining if key == 'remaining_time' else table.column(key).tolist()
+        n = len(arrival)
+        start = [-1] * n
+        completion = [-1] * n
+        order = self._arrival_order(arrival)
+        next_arrival = 0
+        ready = []
+        gantt_chart = GanttChart(names)
         current_time = 0
         completed = 0
-        n = len(self.processes)
-        gantt_chart = []
+        current = previous = None
+        last_time = 0
+        trace = self.tracer
+        if trace is not None:
+            trace.begin('SRTF' if key == 'remaining_time' else 'Priority (preemptive)', names)
         
         while completed < n:
-            # Get available processes
-            available = [p for p in self.processes 
-                        if p['arrival_time'] <= current_time and p['remaining_time'] > 0]
-            
-            if not available:
-                current_time += 1
+            # Admit everything that has arrived by now
+            while next_arrival < n and arrival[order[next_arrival]] <= current_time:
+                i = order[next_arrival]
+                heapq.heappush(ready, (keys[i], i))
+                if trace is not None:
+                    trace.arrive(arrival[i], i)
+                next_arrival += 1
+            if trace is not None:
+                trace.sample(current_time, len(ready))
+            
+            if current is None:
+                if not ready:
+                    # CPU is idle, skip straight to the next arrival
+                    if trace is not None:
+                        trace.idle(current_time, arrival[order[next_arrival]])
+                    current_time = arrival[order[next_arrival]]
+                    continue
+                
+                _, current = heapq.heappop(ready)
+                current_time = self._switch(gantt_chart, previous, current, current_time)
+                previous = current
+                last_time = current_time
+                if start[current] == -1:
+                    start[current] = current_time
+                if trace is not None:
+                    trace.dispatch(current_time, current)
+                if next_arrival < n and arrival[order[next_arrival]] <= current_time:
+                    # Admit what arrived during the switch
+                    continue
+            elif ready and ready[0] < (keys[current], current) and current_time > last_time:
+                # A newly arrived process beats the running one
+                gantt_chart.append(current, last_time, current_time)
+                heapq.heappush(ready, (keys[current], current))
+                if trace is not None:
+                    trace.preempt(current_time, current)
+                current = None
                 continue
             
-            # Select process with highest priority (lowest number = highest priority)
-            next_process = min(available, key=lambda x: x['priority'])
+            finish_time = current_time + remaining[current]
             
-            start_time = current_time
-            end_time = current_time + next_process['burst_time']
-            gantt_chart.append((next_process['name'], start_time, end_time))
+            # Run until the next arrival if it comes before completion
+            if next_arrival < n:
+                arrival_time = arrival[order[next_arrival]]
+                if arrival_time < finish_time:
+                    remaining[current] -= arrival_time - current_time
+                    current_time = arrival_time
+                    continue
             
-            current_time = end_time
-            next_process['remaining_time'] = 0
-            next_process['start_time'] = start_time
-            next_process['completion_time'] = end_time
-            next_process['first_execution'] = start_time
+            current_time = finish_time
+            remaining[current] = 0
+            gantt_chart.append(current, last_time, current_time)
+            completion[current] = current_time
             completed += 1
+            if trace is not None:
+                trace.complete(current_time, current)
+            current = None
         
+        self._store_schedule(start, completion)
         return gantt_chart
     
-    def priority_preemptive(self):
+    def mlfq(self, levels=3, time_quantum=2, quanta=None, boost_interval=None):
+        """Multilevel feedback queue scheduling.
+        
+        Arrivals enter level 0 (the highest); the highest non-empty level
+        runs, Round Robin within a level, and a process arriving at a higher
+        level than the running one preempts it. A process that has used up
+        its level's quantum in total (``quanta``, by default
+        ``time_quantum * 2**level``) moves down a level. Every
+        ``boost_interval`` time units all processes move back to level 0.
+        The clock jumps between arrivals, quantum expiries, completions and
+        boosts.
+        
+        Per-level statistics are left in ``self.level_stats``: the quantum,
+        CPU time spent at the level and its share of all CPU time, how many
+        processes entered the level, and their average response time there
+        (from entering the level to first running at it).
+        """
+        if quanta is None:
+            quanta = [time_quantum * 2 ** level for level in range(levels)]
+        if len(quanta) != levels or levels < 1:
+            raise ValueError("need one quantum per level and at least one level")
+        if min(quanta) <= 0:
+            raise ValueError("quanta must be positive")
+        if boost_interval is not None and boost_interval <= 0:
+            raise ValueError("boost_interval must be positive")
+        
+        self.level_stats = []
         if not self.processes:
-            return []
+            return GanttChart([])
         
         self.reset_processes()
+        table = self.processes
+        names = table.names
+        arrival = table.column('arrival_time').tolist()
+        remaining = table.column('burst_time').tolist()
+        n = len(arrival)
+        start = [-1] * n
+        completion = [-1] * n
+        order = self._arrival_order(arrival)
+        next_arrival = 0
+        queues = [deque() for _ in range(levels)]
+        level = [0] * n
+        used = [0] * n
+        entered = [0] * n
+        waiting_first_run = [True] * n
+        cpu_time = [0] * levels
+        entries = [0] * levels
+        response_total = [0] * levels
+        gantt_chart = GanttChart(names)
         current_time = 0
         completed = 0
-        n = len(self.processes)
-        gantt_chart = []
-        current_process = None
-        last_time = 0
+        current = previous = None
+        segment_start = charged_until = 0
+        next_boost = boost_interval
+        trace = self.tracer
+        if trace is not None:
+            trace.begin(f'MLFQ ({levels} levels)', names)
+        
+        def enter(i, new_level, time):
+            level[i] = new_level
+            used[i] = 0
+            entered[i] = time
+            waiting_first_run[i] = True
+            entries[new_level] += 1
+        
+        def charge():
+            # Account the running process's CPU time to its current level
+            nonlocal charged_until
+            delta = current_time - charged_until
+            used[current] += delta
+            cpu_time[level[current]] += delta
+            charged_until = current_time
+        
+        def first_run(i):
+            if waiting_first_run[i]:
+                waiting_first_run[i] = False
+                response_total[level[i]] += current_time - entered[i]
+        
+        def top_level():
+            for l in range(levels):
+                if queues[l]:
+                    return l
+            return None
         
         while completed < n:
-            # Get available processes
-            available = [p for p in self.processes 
-                        if p['arrival_time'] <= current_time and p['remaining_time'] > 0]
-            
-            if not available:
-                if current_process:
-                    # End the current process segment
-                    gantt_chart.append((current_process['name'], last_time, current_time))
-                    current_process = None
-                current_time += 1
-                continue
-            
-            # Select process with highest priority (lowest number)
-            next_process = min(available, key=lambda x: x['priority'])
-            
-            if current_process != next_process:
-                if current_process is not None and current_process['remaining_time'] > 0:
-                    # Add previous process to gantt chart
-                    gantt_chart.append((current_process['name'], last_time, current_time))
+            # Admit everything that has arrived by now
+            while next_arrival < n and arrival[order[next_arrival]] <= current_time:
+                i = order[next_arrival]
+                enter(i, 0, arrival[i])
+                queues[0].append(i)
+                if trace is not None:
+                    trace.arrive(arrival[i], i)
+                next_arrival += 1
+            if trace is not None:
+                trace.sample(current_time, sum(map(len, queues)))
+            
+            if next_boost is not None and current_time >= next_boost:
+                # Priority boost: everyone back to level 0, in level order
+                for l in range(1, levels):
+                    while queues[l]:
+                        i = queues[l].popleft()
+                        enter(i, 0, current_time)
+                        queues[0].append(i)
+                if current is not None and level[current] != 0:
+                    charge()
+                    enter(current, 0, current_time)
+                    first_run(current)
+                while next_boost <= current_time:
+                    next_boost += boost_interval
+            
+            if current is None:
+                top = top_level()
+                if top is None:
+                    # CPU is idle, skip straight to the next arrival
+                    if trace is not None:
+                        trace.idle(current_time, arrival[order[next_arrival]])
+                    current_time = arrival[order[next_arrival]]
+                    continue
                 
-                current_process = next_process
-                last_time = current_time
+                current = queues[top].popleft()
+                current_time = self._switch(gantt_chart, previous, current, current_time)
+                previous = current
+                segment_start = charged_until = current_time
+                if start[current] == -1:
+                    start[current] = current_time
+                first_run(current)
+                if trace is not None:
+                    trace.dispatch(current_time, current)
+                if ((next_arrival < n and arrival[order[next_arrival]] <= current_time)
+                        or (next_boost is not None and next_boost <= current_time)):
+                    # Admit what arrived (and boost if due) during the switch
+                    continue
+            else:
+                top = top_level()
+                if used[current] + current_time - charged_until >= quanta[level[current]]:
+                    # Quantum used up: move down a level (or start a new one at the bottom)
+                    charge()
+                    if level[current] < levels - 1:
+                        enter(current, level[current] + 1, current_time)
+                    else:
+                        used[current] = 0
+                    if top is not None and top <= level[current]:
+                        gantt_chart.append(current, segment_start, current_time)
+                        queues[level[current]].append(current)
+                        if trace is not None:
+                            trace.preempt(current_time, current)
+                        current = None
+                        continue
+                    # Nobody else is waiting at or above its level: keep running
+                    first_run(current)
+                elif top is not None and top < level[current] and current_time > segment_start:
+                    # A process at a higher level preempts the running one
+                    charge()
+                    gantt_chart.append(current, segment_start, current_time)
+                    queues[level[current]].append(current)
+                    if trace is not None:
+                        trace.preempt(current_time, current)
+                    current = None
+                    continue
+            
+            stop = min(current_time + remaining[current],
+                       current_time + quanta[level[current]] - used[current]
+                       - (current_time - charged_until))
+            if level[current] > 0 and next_arrival < n:
+                # Arrivals enter level 0 and would preempt it
+                stop = min(stop, arrival[order[next_arrival]])
+            if next_boost is not None:
+                stop = min(stop, next_boost)
+            
+            remaining[current] -= stop - current_time
+            current_time = stop
+            if remaining[current] == 0:
+                charge()
+                gantt_chart.append(current, segment_start, current_time)
+                completion[current] = current_time
+                completed += 1
+                if trace is not None:
+                    trace.complete(current_time, current)
+                current = None
+        
+        total_cpu = sum(cpu_time)
+        for l in range(levels):
+            self.level_stats.append({
+                'level': l,
+                'quantum': quanta[l],
+                'cpu_time': cpu_time[l],
+                'cpu_share': cpu_time[l] / total_cpu if total_cpu else 0.0,
+                'processes': entries[l],
+                'avg_response_time': response_total[l] / entries[l] if entries[l] else 0.0
+            })
+        
+        self._store_schedule(start, completion)
+        return gantt_chart
+    
+    def cfs(self, target_latency=6, min_granularity=1):
+        """Completely Fair Scheduler, modelled on Linux's CFS.
+        
+        Each process's ``priority`` is its nice value (clamped to -20..19)
+        and maps to a load weight. A process's virtual runtime grows by its
+        CPU time scaled by ``NICE_0_WEIGHT / weight``, and the runnable
+        process with the smallest vruntime runs next (a heap keyed by
+        ``(vruntime, index)``, so each decision is O(log n)). It runs for
+        its weighted share of the scheduling period, ``target_latency``
+        stretched to ``min_granularity`` per runnable process, but never
+        less than ``min_granularity``. Arrivals start at the queue's minimum
+        vruntime and wait for the running slice to end. Times are integers.
+        
+        Every slice costs a heap pop and push, so the run time grows with
+        the number of slices: about the total CPU time over
+        ``min_granularity`` once more than ``target_latency /
+        min_granularity`` processes are runnable.
+        """
+        if target_latency <= 0 or min_granularity <= 0:
+            raise ValueError("target_latency and min_granularity must be positive")
+        if not self.processes:
+            return GanttChart([])
+        
+        self.reset_processes()
+        table = self.processes
+        names = table.names
+        arrival = table.column('arrival_time').tolist()
+        remaining = table.column('burst_time').tolist()
+        nice = np.clip(table.column('priority'), -20, 19) + 20
+        weight = np.array(NICE_TO_WEIGHT)[nice].tolist()
+        n = len(arrival)
+        start = [-1] * n
+        completion = [-1] * n
+        vruntime = [0.0] * n
+        order = self._arrival_order(arrival)
+        next_arrival = 0
+        ready = []
+        total_weight = 0
+        min_vruntime = 0.0
+        gantt_chart = GanttChart(names)
+        current_time = 0
+        completed = 0
+        current = previous = None
+        slice_end = 0
+        trace = self.tracer
+        if trace is not None:
+            trace.begin('CFS', names)
+        heappush, heappop = heapq.heappush, heapq.heappop
+        append = gantt_chart.append
+        
+        while completed < n:
+            # Admit everything that has arrived by now at the minimum vruntime
+            while next_arrival < n and arrival[order[next_arrival]] <= current_time:
+                i = order[next_arrival]
+                vruntime[i] = min_vruntime
+                heappush(ready, (min_vruntime, i))
+                total_weight += weight[i]
+                if trace is not None:
+                    trace.arrive(arrival[i], i)
+                next_arrival += 1
+            if trace is not None:
+                trace.sample(current_time, len(ready))
+            
+            if current is None:
+                if not ready:
+                    # CPU is idle, skip straight to the next arrival
+                    if trace is not None:
+                        trace.idle(current_time, arrival[order[next_arrival]])
+                    current_time = arrival[order[next_arrival]]
+                    continue
                 
-                if current_process['first_execution'] == -1:
-                    current_process['first_execution'] = current_time
-                if current_process['start_time'] == -1:
-                    current_process['start_time'] = current_time
-            
-            # Execute for 1 time unit
-            current_time += 1
-            current_process['remaining_time'] -= 1
-            
-            if current_process['remaining_time'] == 0:
-                gantt_chart.append((current_process['name'], last_time, current_time))
-                current_process['completion_time'] = current_time
+                _, current = heappop(ready)
+                current_time = self._switch(gantt_chart, previous, current, current_time)
+                previous = current
+                if start[current] == -1:
+                    start[current] = current_time
+                if trace is not None:
+                    trace.dispatch(current_time, current)
+                period = max(target_latency, (len(ready) + 1) * min_granularity)
+                slice_end = current_time + max(min_granularity,
+                                               period * weight[current] // total_weight)
+                if next_arrival < n and arrival[order[next_arrival]] <= current_time:
+                    # Admit what arrived during the switch
+                    continue
+            
+            # Run the whole slice. Arrivals during it are placed at min_vruntime
+            # as of their arrival; only the first can raise it, since the rest
+            # then find that first arrival at the front of the queue.
+            stop = min(slice_end, current_time + remaining[current])
+            if next_arrival < n and arrival[order[next_arrival]] < stop:
+                arrived = arrival[order[next_arrival]]
+                running = (vruntime[current]
+                           + (arrived - current_time) * NICE_0_WEIGHT / weight[current])
+                min_vruntime = max(min_vruntime, min(running, ready[0][0]) if ready else running)
+                while next_arrival < n and arrival[order[next_arrival]] < stop:
+                    i = order[next_arrival]
+                    vruntime[i] = min_vruntime
+                    heappush(ready, (min_vruntime, i))
+                    total_weight += weight[i]
+                    if trace is not None:
+                        trace.arrive(arrival[i], i)
+                    next_arrival += 1
+            append(current, current_time, stop)
+            remaining[current] -= stop - current_time
+            vruntime[current] += (stop - current_time) * NICE_0_WEIGHT / weight[current]
+            current_time = stop
+            
+            if remaining[current] == 0:
+                completion[current] = current_time
+                total_weight -= weight[current]
                 completed += 1
-                current_process = None
+                if trace is not None:
+                    trace.complete(current_time, current)
+            else:
+                heappush(ready, (vruntime[current], current))
+                if trace is not None:
+                    trace.preempt(current_time, current)
+            current = None
+            
+            # min_vruntime only moves forward
+            if ready and ready[0][0] > min_vruntime:
+                min_vruntime = ready[0][0]
         
+        self._store_schedule(start, completion)
         return gantt_chart
     
-    def calculate_metrics(self, gantt_chart):
+    @staticmethod
+    def count_context_switches(gantt_chart):
+        """Number of times the CPU is handed to a different process"""
+        if isinstance(gantt_chart, GanttChart):
+            process = gantt_chart.process
+            return int(np.count_nonzero(np.diff(process[process != OVERHEAD])))
+        
+        switches = 0
+        previous = None
+        for name, start, end in gantt_chart:
+            if name == OVERHEAD_NAME:
+                continue
+            if previous is not None and name != previous:
+                switches += 1
+            previous = name
+        return switches
+    
+    def cpu_usage(self, gantt_chart):
+        """Context switches, switching overhead and utilization of a schedule.
+        
+        ``gantt_chart`` is one chart or a list of per-core charts. The
+        elapsed time runs from the first arrival to the last completion on
+        every core; ``overhead_fraction`` is the share of busy CPU time spent
+        switching, ``effective_utilization`` the share of elapsed time spent
+        running processes, and ``throughput`` is processes completed per
+        time unit.
+        """
+        if isinstance(gantt_chart, GanttChart):
+            charts = [gantt_chart]
+        elif not gantt_chart:
+            charts = []
+        elif isinstance(gantt_chart[0], GanttChart):
+            charts = list(gantt_chart)
+        else:
+            charts = [GanttChart.from_segments(gantt_chart)]
+        
+        switches = overhead = useful = 0
+        for chart in charts:
+            switches += self.count_context_switches(chart)
+            length = chart.end - chart.start
+            is_overhead = chart.process == OVERHEAD
+            overhead += int(length[is_overhead].sum())
+            useful += int(length[~is_overhead].sum())
+        
+        completion = self.processes.column('completion_time')
+        done = completion != -1
+        elapsed = (int(completion[done].max() - self.processes.column('arrival_time').min())
+                   if done.any() else 0)
+        capacity = elapsed * max(1, len(charts))
+        return {
+            'context_switches': switches,
+            'switch_cost': self.switch_cost,
+            'overhead_time': overhead,
+            'overhead_fraction': overhead / (overhead + useful) if overhead + useful else 0.0,
+            'cpu_utilization': (overhead + useful) / capacity if capacity else 0.0,
+            'effective_utilization': useful / capacity if capacity else 0.0,
+            'throughput': int(done.sum()) / elapsed if elapsed else 0.0
+        }
+    
+    def calculate_metrics(self, gantt_chart, aggregate_only=False, logger=None):
+        """Turnaround, waiting and response times for every completed process.
+
+        All times are computed at once on the table columns. The result maps
+        process names to their metrics plus ``'_averages'``, ``'_summary'``
+        (mean/min/max/std per metric) and ``'_cpu'`` (see cpu_usage); with
+        ``aggregate_only`` only those three entries are built. Diagnostics go
+        to ``logger`` (this module's logger by default) instead of stdout.
+        """
         if not self.processes:
             return {}
         
-        metrics = {}
-        total_tat = 0
-        total_wt = 0
-        total_rt = 0
-        count = 0
+        log = logger if logger is not None else _logger
+        table = self.processes
+        completion = table.column('completion_time')
+        done = completion != -1
         
-        print(f"\n=== Calculating Metrics for {len(self.processes)} processes ===")
+        if not done.all():
+            missing = np.flatnonzero(~done)
+            log.warning("%d of %d processes have no completion time (first: %s)",
+                        len(missing), len(table), table.names[missing[0]])
         
-        for process in self.processes:
-            name = process['name']
-            
-            # Check if process was completed
-            if process.get('completion_time', -1) == -1:
-                print(f"❌ Process {name} has no completion time!")
-                print(f"   Arrival: {process['arrival_time']}, Burst: {process['burst_time']}")
-                print(f"   Remaining: {process['remaining_time']}, First Exec: {process.get('first_execution', 'N/A')}")
-                print(f"   Start Time: {process.get('start_time', 'N/A')}")
-                continue
-            
-            completion_time = process['completion_time']
-            arrival_time = process['arrival_time']
-            burst_time = process['burst_time']
-            first_execution = process.get('first_execution', completion_time)
-            
-            turnaround_time = completion_time - arrival_time
-            waiting_time = turnaround_time - burst_time
-            response_time = first_execution - arrival_time
-            
-            # Ensure non-negative values
-            waiting_time = max(0, waiting_time)
-            response_time = max(0, response_time)
-            
-            metrics[name] = {
-                'arrival_time': arrival_time,
-                'burst_time': burst_time,
-                'priority': process.get('priority', 0),
-                'completion_time': completion_time,
-                'turnaround_time': turnaround_time,
-                'waiting_time': waiting_time,
-                'response_time': response_time
-            }
-            
-            total_tat += turnaround_time
-            total_wt += waiting_time
-            total_rt += response_time
-            count += 1
-            
-            print(f"✅ {name}: AT={arrival_time}, BT={burst_time}, CT={completion_time}")
-            print(f"   First Exec: {first_execution}, TAT={turnaround_time}, WT={waiting_time}, RT={response_time}")
-        
-        # Calculate averages
-        if count > 0:
-            metrics['_averages'] = {
-                'avg_turnaround_time': total_tat / count,
-                'avg_waiting_time': total_wt / count,
-                'avg_response_time': total_rt / count
+        if not done.any():
+            log.warning("No processes were completed successfully!")
+            return {}
+        
+        arrival = table.column('arrival_time')[done]
+        burst = table.column('burst_time')[done]
+        completion = completion[done]
+        first_execution = table.column('first_execution')[done]
+        
+        turnaround = completion - arrival
+        # Ensure non-negative values
+        waiting = np.maximum(turnaround - burst, 0)
+        response = np.maximum(first_execution - arrival, 0)
+        
+        metrics = {}
+        if not aggregate_only:
+            names = table.names if done.all() else [table.names[i] for i in np.flatnonzero(done)]
+            priority = table.column('priority')[done]
+            for row in zip(names, arrival.tolist(), burst.tolist(), priority.tolist(),
+                           completion.tolist(), turnaround.tolist(), waiting.tolist(),
+                           response.tolist()):
+                metrics[row[0]] = {
+                    'arrival_time': row[1],
+                    'burst_time': row[2],
+                    'priority': row[3],
+                    'completion_time': row[4],
+                    'turnaround_time': row[5],
+                    'waiting_time': row[6],
+                    'response_time': row[7]
+                }
+        
+        summary = {}
+        for key, values in (('turnaround_time', turnaround),
+                            ('waiting_time', waiting),
+                            ('response_time', response)):
+            summary[key] = {
+                'mean': float(values.mean()),
+                'min': int(values.min()),
+                'max': int(values.max()),
+                'std': float(values.std())
             }
-            
-            print(f"\n📊 Averages: TAT={metrics['_averages']['avg_turnaround_time']:.2f}, "
-                  f"WT={metrics['_averages']['avg_waiting_time']:.2f}, "
-                  f"RT={metrics['_averages']['avg_response_time']:.2f}")
-        else:
-            print("❌ No processes were completed successfully!")
-            # Debug all processes
-            for i, process in enumerate(self.processes):
-                print(f"Process {i}: {process['name']} - "
-                      f"arrival={process['arrival_time']}, burst={process['burst_time']}, "
-                      f"remaining={process['remaining_time']}, completion={process.get('completion_time', 'Not set')}, "
-                      f"first_exec={process.get('first_execution', 'Not set')}")
-        
-        return metrics
\ No newline at end of file
+        
+        metrics['_averages'] = {
+            'avg_turnaround_time': summary['turnaround_time']['mean'],
+            'avg_waiting_time': summary['waiting_time']['mean'],
+            'avg_response_time': summary['response_time']['mean']
+        }
+        metrics['_summary'] = summary
+        metrics['_cpu'] = self.cpu_usage(gantt_chart)
+        
+        log.debug("Averages over %d processes: TAT=%.2f, WT=%.2f, RT=%.2f",
+                  len(turnaround), summary['turnaround_time']['mean'],
+                  summary['waiting_time']['mean'], summary['response_time']['mean'])
+        
+        return metrics
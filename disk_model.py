@@ -0,0 +1,73 @@
+import math
+
+import numpy as np
+
+
+class DiskModel:
+    """Service time of disk requests in milliseconds.
+
+    A request costs seek + rotational latency + transfer:
+
+    - Seeking ``d > 0`` cylinders takes ``settle_time + a * sqrt(d)`` up to
+      ``knee`` cylinders and grows linearly beyond it (the two pieces meet
+      smoothly). ``a`` is chosen so a full-stroke seek takes
+      ``full_stroke_time``.
+    - The platter spins at ``rpm`` starting with sector 0 under the head at
+      time 0; after the seek the head waits for the request's sector.
+    - Transferring ``size`` sectors takes ``size / sectors_per_track`` of a
+      revolution.
+
+    ``seek_time``, ``rotational_latency`` and ``transfer_time`` accept
+    scalars or NumPy arrays.
+    """
+
+    def __init__(self, disk_size=200, settle_time=1.0, full_stroke_time=16.0, knee=None,
+                 rpm=7200, sectors_per_track=63, request_size=8):
+        if disk_size < 2:
+            raise ValueError("disk_size must be at least 2")
+        if full_stroke_time <= settle_time:
+            raise ValueError("full_stroke_time must be larger than settle_time")
+        self.disk_size = disk_size
+        self.settle_time = settle_time
+        self.full_stroke_time = full_stroke_time
+        self.knee = knee if knee is not None else max(1, (disk_size - 1) // 5)
+        self.rotation_time = 60000.0 / rpm
+        self.sectors_per_track = sectors_per_track
+        self.request_size = request_size
+
+        root = math.sqrt(self.knee)
+        full_stroke = disk_size - 1
+        # Linear slope equals the slope of the sqrt curve at the knee
+        self.sqrt_coefficient = (full_stroke_time - settle_time) / (
+            root + max(0, full_stroke - self.knee) / (2 * root))
+        self.linear_coefficient = self.sqrt_coefficient / (2 * root)
+
+    def seek_time(self, distance):
+        if isinstance(distance, np.ndarray):
+            distance = np.abs(distance)
+            short = self.settle_time + self.sqrt_coefficient * np.sqrt(np.minimum(distance, self.knee))
+            long = self.linear_coefficient * np.maximum(distance - self.knee, 0)
+            return np.where(distance > 0, short + long, 0.0)
+        distance = abs(distance)
+        if distance == 0:
+            return 0.0
+        if distance <= self.knee:
+            return self.settle_time + self.sqrt_coefficient * math.sqrt(distance)
+        return (self.settle_time + self.sqrt_coefficient * math.sqrt(self.knee)
+                + self.linear_coefficient * (distance - self.knee))
+
+    def rotational_latency(self, time, sector):
+        """Wait at ``time`` until ``sector`` comes under the head"""
+        under_head = (time / self.rotation_time) % 1.0
+        return ((sector / self.sectors_per_track - under_head) % 1.0) * self.rotation_time
+
+    def transfer_time(self, size):
+        return size / self.sectors_per_track * self.rotation_time
+
+    def access_time(self, time, position, cylinder, sector=0, size=None):
+        """Seek + rotation + transfer for a request started at ``time``"""
+        seek = self.seek_time(cylinder - position)
+        if size is None:
+            size = self.request_size
+        return (seek + self.rotational_latency(time + seek, sector)
+                + self.transfer_time(size))
@@ -1,92 +1,257 @@
+# NumPy is imported on first use so that importing disk_scheduler stays
+# cheap; the process table already makes cpu_scheduler pay for it.
+import bisect
+
+
 class DiskScheduler:
+    """Disk head scheduling over a static list of cylinder requests.
+
+    Each algorithm has an ``*_array`` form that works on NumPy arrays and
+    returns the head sequence (starting with ``head_start``) as an array;
+    the list methods are thin wrappers that return plain Python lists.
+    
+    SCAN and C-SCAN travel to the disk edges (0 and ``disk_size - 1``);
+    LOOK and C-LOOK turn around at the outermost requests. After an
+    elevator algorithm runs, ``max_bypassed`` holds the largest number of
+    requests that were queued when a sweep started but not served during
+    it, i.e. that waited through a whole sweep; a measure of how long
+    requests can be starved.
+    """
+    
     def __init__(self):
         self.requests = []
         self.head_start = 0
+        self._array = None
+        self.max_bypassed = None
     
     def set_requests(self, requests, head_start):
         self.requests = requests.copy()
         self.head_start = head_start
+        self._array = None
     
-    def fcfs(self):
-        if not self.requests:
-            return []
+    @property
+    def _request_array(self):
+        """The requests as an array, built by the first algorithm that runs"""
+        if self._array is None:
+            import numpy as np
+            
+            self._array = (np.array(self.requests) if len(self.requests)
+                           else np.empty(0, dtype=np.int64))
+        return self._array
+    
+    def _sequence(self, order):
+        import numpy as np
         
-        sequence = [self.head_start] + self.requests
-        return sequence
+        return np.concatenate(([self.head_start], order))
     
-    def sstf(self):
-        if not self.requests:
-            return []
+    def fcfs_array(self):
+        self.max_bypassed = None
+        requests = self._request_array
+        if not len(requests):
+            return requests[:0]
         
-        sequence = [self.head_start]
+        return self._sequence(requests)
+    
+    def sstf_array(self):
+        import numpy as np
+        
+        self.max_bypassed = None
+        requests = self._request_array
+        if not len(requests):
+            return requests[:0]
+        
+        # Once the head reaches a cylinder every duplicate there is served at
+        # zero cost, so only the distinct cylinders matter. The unserved ones
+        # always form a gap around the head, so the closest request is one of
+        # the two frontier cylinders on either side of it.
+        cylinders, first_seen, counts = np.unique(requests, return_index=True,
+                                                  return_counts=True)
+        values = cylinders.tolist()
+        first_seen = first_seen.tolist()
         current_position = self.head_start
-        remaining_requests = self.requests.copy()
+        right = bisect.bisect_right(values, current_position)
+        left = right - 1
+        order = []
         
-        while remaining_requests:
-            # Find closest request
-            closest = min(remaining_requests, 
-                         key=lambda x: abs(x - current_position))
-            sequence.append(closest)
-            current_position = closest
-            remaining_requests.remove(closest)
+        while left >= 0 or right < len(values):
+            if right == len(values):
+                go_left = True
+            elif left < 0:
+                go_left = False
+            else:
+                left_distance = current_position - values[left]
+                right_distance = values[right] - current_position
+                # Equal distances go to the request that came first, as min() did
+                go_left = (left_distance < right_distance or
+                           (left_distance == right_distance and first_seen[left] < first_seen[right]))
+            if go_left:
+                order.append(left)
+                current_position = values[left]
+                left -= 1
+            else:
+                order.append(right)
+                current_position = values[right]
+                right += 1
         
-        return sequence
+        return self._sequence(np.repeat(cylinders[order], counts[order]))
     
-    def scan(self, disk_size=200):
-        if not self.requests:
-            return []
+    def _check_bounds(self, disk_size):
+        requests = self._request_array
+        if (requests.min() < 0 or requests.max() >= disk_size
+                or not 0 <= self.head_start < disk_size):
+            raise ValueError(f"requests and head start must lie in [0, {disk_size - 1}]")
+    
+    def _elevator(self, batches, disk_size=200, to_edge=True, circular=False):
+        """Serve each batch of request indices in elevator order, one batch at a time.
         
-        sequence = [self.head_start]
-        current_position = self.head_start
+        The head first moves towards cylinder 0 (circular: towards the top)
+        and serves every request of the current batch it reaches, including
+        one at its own cylinder. It turns around at the disk edge (to_edge)
+        or at the last request in that direction; circular sweeps instead
+        jump back to cylinder 0 (to_edge) or to the lowest request and sweep
+        up again. Later batches wait until the current one is done.
+        """
+        import numpy as np
         
-        # Separate requests into left and right of current position
-        left_requests = [r for r in self.requests if r <= current_position]
-        right_requests = [r for r in self.requests if r > current_position]
+        self.max_bypassed = 0
+        requests = self._request_array
+        if not len(requests):
+            return requests[:0]
+        if to_edge:
+            self._check_bounds(disk_size)
         
-        # Sort left in descending, right in ascending
-        left_requests.sort(reverse=True)
-        right_requests.sort()
+        # One sorted index of the distinct cylinders, shared by all batches
+        cylinders, codes = np.unique(requests, return_inverse=True)
+        codes = codes.ravel()
+        # Every request is queued from the start
+        pending = len(requests)
+        top, bottom = cylinders.dtype.type(disk_size - 1), cylinders.dtype.type(0)
+        position = self.head_start
+        upward = circular
+        path = [np.array([position], dtype=cylinders.dtype)]
         
-        # Go to 0 first if there are left requests
-        if left_requests:
-            sequence.extend(left_requests)
+        for batch in batches:
+            batch_codes = np.sort(codes[batch])
+            values = cylinders[batch_codes]
+            if upward:
+                split = np.searchsorted(values, position, side='left')
+                ahead, behind = values[split:], values[:split]
+            else:
+                split = np.searchsorted(values, position, side='right')
+                ahead, behind = values[:split][::-1], values[split:]
+            
+            if len(behind) and to_edge:
+                turn = top if upward else bottom
+            else:
+                turn = ahead[-1] if len(ahead) else position
+            path.append(ahead)
+            if turn != (ahead[-1] if len(ahead) else position):
+                path.append(np.array([turn], dtype=cylinders.dtype))
+            sweeps = [(position, turn, len(ahead))]
+            
+            if len(behind):
+                if circular:
+                    if to_edge and behind[0] != bottom:
+                        path.append(np.array([bottom], dtype=cylinders.dtype))
+                    start = bottom if to_edge else behind[0]
+                else:
+                    upward = not upward
+                    behind = behind if upward else behind[::-1]
+                    start = turn
+                path.append(behind)
+                sweeps.append((start, behind[-1], len(behind)))
+                position = behind[-1]
+            else:
+                position = turn
+            
+            # Requests queued at the start of a sweep that it did not serve
+            for first, last, served in sweeps:
+                if first == last and not served:
+                    continue
+                self.max_bypassed = max(self.max_bypassed, pending - served)
+                pending -= served
         
-        # Then go to disk_size if there are right requests
-        if right_requests:
-            sequence.extend(right_requests)
+        return np.concatenate(path)
+    
+    def scan_array(self, disk_size=200):
+        """Sweep down to cylinder 0, then back up to the highest request"""
+        return self._elevator([slice(None)], disk_size)
+    
+    def c_scan_array(self, disk_size=200):
+        """Sweep up to disk_size-1, jump to cylinder 0 and sweep up again"""
+        return self._elevator([slice(None)], disk_size, circular=True)
+    
+    def look_array(self):
+        """SCAN that turns around at the last request instead of the edge"""
+        return self._elevator([slice(None)], to_edge=False)
+    
+    def c_look_array(self):
+        """C-SCAN that only goes as far as the highest and lowest requests"""
+        return self._elevator([slice(None)], to_edge=False, circular=True)
+    
+    def n_step_scan_array(self, disk_size=200, step=10):
+        """SCAN over consecutive groups of ``step`` requests, one group at a time"""
+        if step <= 0:
+            raise ValueError("step must be positive")
+        batches = [slice(i, i + step) for i in range(0, len(self._request_array), step)]
+        return self._elevator(batches, disk_size)
+    
+    def fscan_array(self, disk_size=200):
+        """SCAN over the queue frozen at the start of each sweep.
         
-        return sequence
+        Every request here is queued at time zero, so the first frozen queue
+        holds all of them and the order is the same as SCAN.
+        """
+        return self._elevator([slice(None)], disk_size)
+    
+    def fcfs(self):
+        return self.fcfs_array().tolist()
+    
+    def sstf(self):
+        return self.sstf_array().tolist()
+    
+    def scan(self, disk_size=200):
+        return self.scan_array(disk_size).tolist()
     
     def c_scan(self, disk_size=200):
-        if not self.requests:
-            return []
-        
-        sequence = [self.head_start]
-        current_position = self.head_start
-        
-        # Separate requests
-        left_requests = [r for r in self.requests if r <= current_position]
-        right_requests = [r for r in self.requests if r > current_position]
-        
-        # Sort both in ascending order
-        left_requests.sort()
-        right_requests.sort()
+        return self.c_scan_array(disk_size).tolist()
+    
+    def look(self):
+        return self.look_array().tolist()
+    
+    def c_look(self):
+        return self.c_look_array().tolist()
+    
+    def n_step_scan(self, disk_size=200, step=10):
+        return self.n_step_scan_array(disk_size, step).tolist()
+    
+    def fscan(self, disk_size=200):
+        return self.fscan_array(disk_size).tolist()
+    
+    def simulate(self, arrival_times, algorithm='FCFS', head_speed=1.0, service_time=0.0,
+                 disk_size=200, step=10, model=None, sectors=None, sizes=None):
+        """Replay the requests with arrival times; see disk_simulation.simulate"""
+        from disk_simulation import simulate
         
-        # Service right requests first
-        sequence.extend(right_requests)
+        return simulate(arrival_times, self._request_array, self.head_start, algorithm,
+                        head_speed, service_time, disk_size, step, model, sectors, sizes)
+    
+    def calculate_seek_time_ms(self, sequence, model):
+        """Seek time of ``sequence`` in milliseconds under a DiskModel's seek curve"""
+        if len(sequence) < 2:
+            return 0.0
         
-        # Then jump to beginning and service left requests
-        if left_requests:
-            sequence.extend(left_requests)
+        return float(model.seek_time(self.seek_distances(sequence)).sum())
+    
+    @staticmethod
+    def seek_distances(sequence):
+        """Cylinders crossed on each step of ``sequence``, as an array"""
+        import numpy as np
         
-        return sequence
+        return np.abs(np.diff(np.asarray(sequence)))
     
     def calculate_seek_time(self, sequence):
         if len(sequence) < 2:
             return 0
         
-        seek_time = 0
-        for i in range(1, len(sequence)):
-            seek_time += abs(sequence[i] - sequence[i-1])
-        
-        return seek_time
\ No newline at end of file
+        return self.seek_distances(sequence).sum().item()
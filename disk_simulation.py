@@ -0,0 +1,307 @@
+import bisect
+from collections import deque
+
+import numpy as np
+
+ALGORITHMS = ('FCFS', 'SSTF', 'SCAN', 'CSCAN', 'LOOK', 'CLOOK', 'NSTEP', 'FSCAN', 'SATF')
+
+
+class DiskQueue:
+    """Pending requests of a moving-head disk, served one decision at a time.
+
+    Request ``i`` is for ``cylinders[i]`` (and, with a DiskModel,
+    ``sectors[i]`` and ``sizes[i]``); add() queues it and next() moves the
+    head on to the request the algorithm picks. The queue keeps the head
+    position, the sweep direction, the seek distance and (with a model) the
+    total seek, rotation and transfer times. See simulate() for the rules.
+    """
+
+    def __init__(self, cylinders, algorithm='FCFS', head_start=0, head_speed=1.0,
+                 service_time=0.0, disk_size=200, step=10, model=None, sectors=None, sizes=None):
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown disk algorithm: {algorithm}")
+        if head_speed <= 0:
+            raise ValueError("head_speed must be positive")
+        if step <= 0:
+            raise ValueError("step must be positive")
+        if algorithm == 'SATF' and model is None:
+            raise ValueError("SATF needs a DiskModel")
+        cylinders = np.asarray(cylinders)
+        count = len(cylinders)
+        self.to_edge = algorithm in ('SCAN', 'CSCAN', 'NSTEP', 'FSCAN')
+        if self.to_edge and count and (cylinders.min() < 0 or cylinders.max() >= disk_size
+                                       or not 0 <= head_start < disk_size):
+            raise ValueError(f"requests and head start must lie in [0, {disk_size - 1}]")
+
+        self.targets = cylinders.tolist()
+        self.model = model
+        if model is not None:
+            sectors = np.zeros(count, dtype=np.int64) if sectors is None else np.asarray(sectors)
+            sizes = np.full(count, model.request_size) if sizes is None else np.asarray(sizes)
+            if len(sectors) != count or len(sizes) != count:
+                raise ValueError("sectors and sizes must have one entry per request")
+            self.sectors = sectors.tolist()
+            self.sizes = sizes.tolist()
+            self.seek_time = model.seek_time
+        else:
+            def seek_time(distance):
+                return abs(distance) / head_speed
+            self.seek_time = seek_time
+        self.service_time = service_time
+
+        self.algorithm = algorithm
+        self.step = step
+        self.fifo = algorithm == 'FCFS'
+        self.batched = algorithm in ('NSTEP', 'FSCAN')
+        self.circular = algorithm in ('CSCAN', 'CLOOK')
+        self.top = disk_size - 1
+        # FCFS queue, or the requests waiting for the next N-step/FSCAN batch
+        self.queue = deque()
+        # Pending requests the head may choose from: a sorted list of the
+        # cylinders that have any, and a FIFO of request indices per cylinder
+        self.occupied = []
+        self.buckets = {}
+        self.pending = 0
+
+        self.position = head_start
+        self.upward = self.circular
+        self.seek_distance = 0
+        self.total_seek = self.total_rotation = self.total_transfer = 0.0
+
+    def __len__(self):
+        return self.pending
+
+    def add(self, i):
+        self.pending += 1
+        if self.fifo or self.batched:
+            self.queue.append(i)
+        else:
+            self._insert(i)
+
+    def _insert(self, i):
+        cylinder = self.targets[i]
+        bucket = self.buckets.get(cylinder)
+        if bucket is None:
+            bucket = self.buckets[cylinder] = deque()
+            bisect.insort(self.occupied, cylinder)
+        bucket.append(i)
+
+    def _move(self, target):
+        """Seek to ``target``; returns the seek time"""
+        seek = self.seek_time(target - self.position)
+        self.seek_distance += abs(target - self.position)
+        self.total_seek += seek
+        self.position = target
+        return seek
+
+    def next(self, clock):
+        """Make the next move of the head at ``clock``.
+
+        Returns ``(i, done)``: request ``i`` has been served at ``done``, or
+        ``i`` is None when the head only travelled to a disk edge (or jumped
+        back) and new arrivals should be added before asking again. Must
+        only be called while requests are pending.
+        """
+        occupied = self.occupied
+        buckets = self.buckets
+        position = self.position
+        if self.batched and not occupied:
+            for _ in range(len(self.queue) if self.algorithm == 'FSCAN'
+                           else min(self.step, len(self.queue))):
+                self._insert(self.queue.popleft())
+
+        if self.fifo:
+            i = self.queue.popleft()
+        else:
+            if self.algorithm == 'SATF':
+                i, slot = self._satf(clock)
+            elif self.algorithm == 'SSTF':
+                slot = bisect.bisect_left(occupied, position)
+                if slot == len(occupied):
+                    slot -= 1
+                elif slot and occupied[slot] != position:
+                    left_distance = position - occupied[slot - 1]
+                    right_distance = occupied[slot] - position
+                    # Equal distances go to the request that arrived first
+                    if (left_distance < right_distance or
+                            (left_distance == right_distance and
+                             buckets[occupied[slot - 1]][0] < buckets[occupied[slot]][0])):
+                        slot -= 1
+            elif self.upward:
+                slot = bisect.bisect_left(occupied, position)
+                if slot == len(occupied):
+                    # Nothing left above the head
+                    if self.to_edge and position != self.top:
+                        travel = self.top
+                    elif self.circular:
+                        travel = 0 if self.to_edge else occupied[0]
+                    else:
+                        self.upward = False
+                        return self.next(clock)
+                    return None, clock + self._move(travel)
+            else:
+                slot = bisect.bisect_right(occupied, position) - 1
+                if slot < 0:
+                    # Nothing left below the head
+                    if self.to_edge and position != 0:
+                        return None, clock + self._move(0)
+                    self.upward = True
+                    return self.next(clock)
+
+            target = occupied[slot]
+            bucket = buckets[target]
+            if self.algorithm == 'SATF':
+                bucket.remove(i)
+            else:
+                i = bucket.popleft()
+            if not bucket:
+                del buckets[target]
+                del occupied[slot]
+
+        self.pending -= 1
+        seek = self._move(self.targets[i])
+        if self.model is None:
+            return i, clock + (seek + self.service_time)
+        rotation = self.model.rotational_latency(clock + seek, self.sectors[i])
+        transfer = self.model.transfer_time(self.sizes[i])
+        self.total_rotation += rotation
+        self.total_transfer += transfer
+        return i, clock + (seek + rotation + transfer)
+
+    def _satf(self, clock):
+        """Pending request with the shortest access time, and its cylinder's slot"""
+        occupied = self.occupied
+        position = self.position
+        rotational_latency = self.model.rotational_latency
+        transfer_time = self.model.transfer_time
+        # Seek time only grows with distance, so stop walking outwards
+        # once the seek alone is no better than the best access time
+        right = bisect.bisect_left(occupied, position)
+        left = right - 1
+        best = best_time = slot = None
+        while left >= 0 or right < len(occupied):
+            if right == len(occupied) or (
+                    left >= 0 and position - occupied[left] <= occupied[right] - position):
+                candidate = left
+                left -= 1
+            else:
+                candidate = right
+                right += 1
+            cylinder = occupied[candidate]
+            seek = self.seek_time(cylinder - position)
+            if best is not None and seek > best_time:
+                break
+            for j in self.buckets[cylinder]:
+                # Requests often finish on the same sector boundary, so
+                # round away float noise and let ties go to the oldest
+                access = round(seek + rotational_latency(clock + seek, self.sectors[j])
+                               + transfer_time(self.sizes[j]), 9)
+                if best is None or access < best_time or (access == best_time and j < best):
+                    best, best_time, slot = j, access, candidate
+        return best, slot
+
+
+def simulate(arrival_times, cylinders, head_start=0, algorithm='FCFS', head_speed=1.0,
+             service_time=0.0, disk_size=200, step=10, model=None, sectors=None, sizes=None):
+    """Serve time-stamped requests with a moving head and time every request.
+
+    Times are in milliseconds and ``head_speed`` is in cylinders per
+    millisecond; serving a request takes the seek plus ``service_time``.
+    The head only ever chooses among requests that have already arrived,
+    does not change its mind mid-seek, and waits in place when the queue
+    is empty. The elevator algorithms keep their direction between
+    decisions and use the same rules as DiskScheduler: SCAN and C-SCAN
+    travel to the disk edges before turning or jumping back, N-step SCAN
+    serves the queue ``step`` requests at a time, and FSCAN freezes the
+    whole queue at the start of each sweep.
+
+    With a DiskModel as ``model`` the seek curve, rotational position
+    (``sectors``) and transfer time (``sizes``, in sectors) replace
+    ``head_speed`` and ``service_time``, and SATF becomes available: it
+    serves the pending request with the shortest access time, walking out
+    from the head only while the seek alone could still beat the best
+    candidate found so far.
+
+    Returns a dict with per-request arrays (in input order) ``start_time``,
+    ``completion_time``, ``wait_time`` and ``service_time``, the service
+    ``order`` and a ``summary`` dict (see summarize()).
+    """
+    arrival_times = np.asarray(arrival_times, dtype=float)
+    count = len(arrival_times)
+    if len(cylinders) != count:
+        raise ValueError("arrival_times and cylinders must have the same length")
+    if count and np.any(np.diff(arrival_times) < 0):
+        raise ValueError("arrival times must be non-decreasing")
+    disk = DiskQueue(cylinders, algorithm, head_start, head_speed, service_time, disk_size,
+                     step, model, sectors, sizes)
+
+    arrivals = arrival_times.tolist()
+    start = [0.0] * count
+    completion = [0.0] * count
+    order = []
+    clock = 0.0
+    next_arrival = 0
+
+    while len(order) < count:
+        while next_arrival < count and arrivals[next_arrival] <= clock:
+            disk.add(next_arrival)
+            next_arrival += 1
+        if not disk:
+            # Idle until the next request arrives
+            clock = max(clock, arrivals[next_arrival])
+            continue
+
+        i, done = disk.next(clock)
+        if i is not None:
+            start[i] = clock
+            completion[i] = done
+            order.append(i)
+        clock = done
+
+    start = np.array(start)
+    completion = np.array(completion)
+    result = {
+        'order': np.array(order, dtype=np.int64),
+        'start_time': start,
+        'completion_time': completion,
+        'wait_time': start - arrival_times,
+        'service_time': completion - start,
+    }
+    result['summary'] = summary = summarize(arrival_times, start, completion, disk.seek_distance)
+    if model is not None and count:
+        summary['avg_seek_time'] = disk.total_seek / count
+        summary['avg_rotational_latency'] = disk.total_rotation / count
+        summary['avg_transfer_time'] = disk.total_transfer / count
+    return result
+
+
+def summarize(arrival_times, start_time, completion_time, seek_distance=None):
+    """Latency percentiles, IOPS and queue depth for a finished simulation"""
+    count = len(arrival_times)
+    if not count:
+        return {'requests': 0}
+    latency = completion_time - arrival_times
+    wait = start_time - arrival_times
+    elapsed = float(completion_time.max() - arrival_times[0])
+    p50, p95, p99 = np.percentile(latency, [50, 95, 99]).tolist()
+
+    # Requests waiting (arrived, not yet started) just after each arrival
+    started = np.sort(start_time)
+    depth = np.arange(1, count + 1) - np.searchsorted(started, arrival_times, side='right')
+
+    return {
+        'requests': count,
+        'seek_distance': seek_distance,
+        'elapsed_time': elapsed,
+        'avg_wait_time': float(wait.mean()),
+        'avg_service_time': float((completion_time - start_time).mean()),
+        'avg_latency': float(latency.mean()),
+        'p50_latency': p50,
+        'p95_latency': p95,
+        'p99_latency': p99,
+        'max_latency': float(latency.max()),
+        'iops': count * 1000.0 / elapsed if elapsed > 0 else None,
+        'max_queue_depth': int(depth.max()),
+        # Little's law over the whole run
+        'avg_queue_depth': float(wait.sum() / elapsed) if elapsed > 0 else 0.0
+    }
@@ -0,0 +1,131 @@
+from array import array
+
+import numpy as np
+
+# Process index (and name) of context-switch overhead segments
+OVERHEAD = -1
+OVERHEAD_NAME = 'Context Switch'
+
+
+class GanttChart:
+    """Compact Gantt chart stored as three parallel int64 arrays.
+
+    Each segment is (process index, start, end); names are looked up in the
+    shared ``names`` list only when a segment is turned back into the usual
+    ``(name, start, end)`` tuple. Appending a segment that continues the
+    previous one for the same process extends it instead of adding a new
+    entry. Each stored segment costs 24 bytes.
+
+    Segments with process index OVERHEAD are time the CPU spent switching
+    between processes; they are reported under OVERHEAD_NAME.
+
+    Iterating, indexing and ``len()`` behave like the old list of tuples.
+    The ``process``, ``start`` and ``end`` properties expose NumPy views of
+    the columns without copying, and ``window()`` slices by time the same way.
+    """
+
+    def __init__(self, names):
+        self.names = names
+        self._process = array('q')
+        self._start = array('q')
+        self._end = array('q')
+
+    @classmethod
+    def from_segments(cls, segments, names=None):
+        """Build a chart from ``(name, start, end)`` tuples"""
+        names = list(names) if names is not None else []
+        index = {name: i for i, name in enumerate(names)}
+        chart = cls(names)
+        for name, start, end in segments:
+            i = OVERHEAD if name == OVERHEAD_NAME else index.get(name)
+            if i is None:
+                i = index[name] = len(names)
+                names.append(name)
+            chart.append(i, start, end)
+        return chart
+
+    def label(self, process):
+        """Name of process index ``process``"""
+        return OVERHEAD_NAME if process == OVERHEAD else self.names[process]
+
+    def append(self, process, start, end):
+        if (self._process and self._process[-1] == process
+                and self._end[-1] == start):
+            # Contiguous run of the same process: extend it in place
+            self._end[-1] = end
+            return
+        try:
+            self._process.append(process)
+            self._start.append(start)
+            self._end.append(end)
+        except BufferError:
+            # A NumPy view is still alive; detach from it and retry
+            self._process = array('q', self._process[:len(self._end)])
+            self._start = array('q', self._start[:len(self._end)])
+            self._end = array('q', self._end)
+            self.append(process, start, end)
+
+    @staticmethod
+    def _column(data):
+        if isinstance(data, array):
+            return np.frombuffer(data, dtype=np.int64) if data else np.empty(0, dtype=np.int64)
+        return data
+
+    @property
+    def process(self):
+        return self._column(self._process)
+
+    @property
+    def start(self):
+        return self._column(self._start)
+
+    @property
+    def end(self):
+        return self._column(self._end)
+
+    def window(self, start_time, end_time):
+        """Segments overlapping ``[start_time, end_time)`` as a zero-copy chart.
+
+        Segments are in time order and never overlap, so the window is a
+        contiguous slice found by binary search.
+        """
+        first = int(np.searchsorted(self.end, start_time, side='right'))
+        last = int(np.searchsorted(self.start, end_time, side='left'))
+        last = max(first, last)
+        return GanttWindow(self.names, self.process[first:last],
+                           self.start[first:last], self.end[first:last])
+
+    def __len__(self):
+        return len(self._end)
+
+    def __iter__(self):
+        names = self.names
+        for i, start, end in zip(self._process, self._start, self._end):
+            yield (names[i] if i != OVERHEAD else OVERHEAD_NAME, int(start), int(end))
+
+    def __getitem__(self, i):
+        return (self.label(self._process[i]), int(self._start[i]), int(self._end[i]))
+
+    def __eq__(self, other):
+        if isinstance(other, (GanttChart, list, tuple)):
+            return len(self) == len(other) and all(a == tuple(b) for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self):
+        return f"GanttChart({list(self)!r})"
+
+    def nbytes(self):
+        return self.process.nbytes + self.start.nbytes + self.end.nbytes
+
+
+class GanttWindow(GanttChart):
+    """Read-only slice of a GanttChart whose columns are views into it"""
+
+    def __init__(self, names, process, start, end):
+        self.names = names
+        self._process = process
+        self._start = start
+        self._end = end
+
+    def append(self, process, start, end):
+        raise TypeError("cannot append to a window of a GanttChart")
@@ -0,0 +1,443 @@
+"""Processes that alternate CPU bursts with disk requests, on one CPU and one disk.
+
+Every pairing of a CPU policy with a disk policy runs in one shared event
+loop, so a process blocked on the disk leaves the CPU to the others and the
+disk queue fills up at the rate the CPU policy lets processes reach their
+I/O. Workload files hold one process per line:
+
+    Name Arrival Priority Burst [Cylinder Burst]...
+
+    python io_simulation.py jobs.txt -c FCFS,RR -d FCFS,SSTF --head 53 -f csv
+"""
+import argparse
+import heapq
+import sys
+from collections import deque
+
+import numpy as np
+
+from cpu_scheduler import NICE_0_WEIGHT, NICE_TO_WEIGHT
+from disk_simulation import ALGORITHMS as DISK_ALGORITHMS, DiskQueue
+
+CPU_ALGORITHMS = ('FCFS', 'SJF', 'SRTF', 'RR', 'PRIORITY', 'PRIORITY_P', 'MLFQ', 'CFS')
+# SATF needs a DiskModel, which the command line does not set up
+CLI_DISK_ALGORITHMS = tuple(a for a in DISK_ALGORITHMS if a != 'SATF')
+
+RESULT_FIELDS = ('workload', 'cpu_algorithm', 'disk_algorithm', 'processes', 'requests',
+                 'makespan', 'throughput', 'cpu_utilization', 'disk_utilization', 'overlap',
+                 'avg_turnaround_time', 'avg_cpu_wait', 'avg_io_wait', 'max_ready_queue',
+                 'max_disk_queue', 'seek_distance', 'context_switches')
+
+
+def simulate(processes, cpu_algorithm='FCFS', disk_algorithm='FCFS', time_quantum=2,
+             head_start=0, head_speed=1.0, service_time=0.0, disk_size=200, step=10, model=None,
+             sectors=None, sizes=None, levels=3, boost_interval=None, target_latency=6,
+             min_granularity=1):
+    """Run processes that alternate CPU bursts and disk requests.
+
+    Each process is ``(name, arrival_time, cpu_bursts, cylinders[, priority])``:
+    it runs ``cpu_bursts[0]``, waits for a request to ``cylinders[0]``, runs
+    ``cpu_bursts[1]`` and so on, so it has one cylinder fewer than bursts.
+    The CPU policies are the CPUScheduler ones applied to the current burst
+    (SJF and SRTF look at that burst only, lower priority numbers win) and
+    the disk is a disk_simulation.DiskQueue, with the same head parameters
+    as disk_simulation.simulate(). With a DiskModel, ``sectors`` and
+    ``sizes`` give each request's sector and size, one entry per request
+    in the order of the processes' cylinders. Times are in milliseconds.
+
+    MLFQ takes ``levels`` and ``boost_interval`` as in CPUScheduler.mlfq(),
+    with ``time_quantum`` as the level-0 quantum; a process keeps its level
+    and the quantum it has used there while it waits for the disk. CFS takes
+    ``target_latency`` and ``min_granularity`` as in CPUScheduler.cfs(),
+    with slices rounded down to whole milliseconds the same way; a process
+    coming back from the disk resumes at no less than the queue's minimum
+    vruntime. With a single burst per process both match their CPUScheduler
+    engines.
+
+    Simultaneous events are handled in this order: disk completions, CPU
+    completions, arrivals, then quantum and slice requeues, so processes
+    that become ready at the end of a quantum queue ahead of the one it
+    expired.
+
+    Returns a dict with per-process arrays (in input order)
+    ``completion_time``, ``turnaround_time``, ``cpu_wait`` (ready but not
+    running), ``io_wait`` (queued for the disk) and ``io_time`` (being
+    served), and a ``summary``: ``makespan`` (first arrival to last
+    completion), ``throughput`` (processes per second), CPU and disk
+    utilization, ``overlap`` (share of the makespan with both busy),
+    averages, peak queue lengths, seek distance and context switches.
+    """
+    if cpu_algorithm not in CPU_ALGORITHMS:
+        raise ValueError(f"Unknown CPU algorithm: {cpu_algorithm}")
+    if cpu_algorithm in ('RR', 'MLFQ') and time_quantum <= 0:
+        raise ValueError("time_quantum must be positive")
+    if cpu_algorithm == 'MLFQ' and levels < 1:
+        raise ValueError("need at least one level")
+    if cpu_algorithm == 'MLFQ' and boost_interval is not None and boost_interval <= 0:
+        raise ValueError("boost_interval must be positive")
+    if cpu_algorithm == 'CFS' and (target_latency <= 0 or min_granularity <= 0):
+        raise ValueError("target_latency and min_granularity must be positive")
+
+    names, arrival, bursts, owner, cylinders, priority = [], [], [], [], [], []
+    for p, process in enumerate(processes):
+        name, arrival_time, cpu_bursts, requests = process[:4]
+        if not cpu_bursts or min(cpu_bursts) <= 0:
+            raise ValueError(f"{name}: CPU bursts must be positive and there must be at least one")
+        if len(requests) != len(cpu_bursts) - 1:
+            raise ValueError(f"{name}: expected one cylinder between each pair of CPU bursts")
+        names.append(name)
+        arrival.append(float(arrival_time))
+        bursts.append([float(b) for b in cpu_bursts])
+        priority.append(process[4] if len(process) > 4 else 0)
+        owner.extend([p] * len(requests))
+        cylinders.extend(requests)
+    disk = DiskQueue(np.array(cylinders, dtype=np.int64), disk_algorithm, head_start,
+                     head_speed, service_time, disk_size, step, model, sectors, sizes)
+
+    n = len(names)
+    phase = [0] * n
+    remaining = [b[0] for b in bursts]
+    completion = [0.0] * n
+    cpu_wait = [0.0] * n
+    io_wait = [0.0] * n
+    io_time = [0.0] * n
+    ready_since = [0.0] * n
+    issued = [0.0] * n
+    first_request = [0] * n
+    for p in range(1, n):
+        first_request[p] = first_request[p - 1] + len(bursts[p - 1]) - 1
+
+    fifo = cpu_algorithm in ('FCFS', 'RR')
+    preemptive = cpu_algorithm in ('SRTF', 'PRIORITY_P')
+    round_robin = cpu_algorithm == 'RR'
+    mlfq = cpu_algorithm == 'MLFQ'
+    cfs = cpu_algorithm == 'CFS'
+    ready = deque() if fifo else []
+    order = sorted(range(n), key=arrival.__getitem__)
+    if mlfq:
+        quanta = [time_quantum * 2 ** l for l in range(levels)]
+        queues = [deque() for _ in range(levels)]
+        level = [0] * n
+        used = [0.0] * n
+        next_boost = boost_interval
+    if cfs:
+        weight = [NICE_TO_WEIGHT[min(max(pr, -20), 19) + 20] for pr in priority]
+        vruntime = [0.0] * n
+        min_vruntime = 0.0
+        total_weight = 0
+
+    def key(p):
+        if cpu_algorithm == 'SJF':
+            return bursts[p][phase[p]]
+        if cpu_algorithm == 'SRTF':
+            return remaining[p]
+        return priority[p]
+
+    def waiting():
+        return sum(map(len, queues)) if mlfq else len(ready)
+
+    def current_min_vruntime():
+        # The smallest vruntime of the running and ready processes, never moving back
+        nonlocal min_vruntime
+        smallest = [ready[0][0]] if ready else []
+        if running is not None:
+            smallest.append(vruntime[running]
+                            + (now - segment_start) * NICE_0_WEIGHT / weight[running])
+        if smallest:
+            min_vruntime = max(min_vruntime, min(smallest))
+        return min_vruntime
+
+    def wake(p, arriving):
+        # p becomes runnable, on arrival or back from the disk
+        nonlocal total_weight
+        if mlfq and arriving:
+            level[p] = 0
+            used[p] = 0.0
+        if cfs:
+            vruntime[p] = (current_min_vruntime() if arriving
+                           else max(vruntime[p], current_min_vruntime()))
+            total_weight += weight[p]
+        make_ready(p)
+
+    def make_ready(p):
+        ready_since[p] = now
+        if fifo:
+            ready.append(p)
+        elif mlfq:
+            queues[level[p]].append(p)
+        elif cfs:
+            heapq.heappush(ready, (vruntime[p], p))
+        else:
+            heapq.heappush(ready, (key(p), p))
+
+    def top_level():
+        for l in range(levels):
+            if queues[l]:
+                return l
+        return None
+
+    def pop_ready():
+        if fifo:
+            return ready.popleft()
+        if mlfq:
+            return queues[top_level()].popleft()
+        return heapq.heappop(ready)[1]
+
+    def dispatch(p):
+        nonlocal running, segment_start, slice_end, stop_time, last_run, switches
+        if last_run is not None and last_run != p:
+            switches += 1
+        last_run = running = p
+        cpu_wait[p] += now - ready_since[p]
+        segment_start = now
+        stop_time = now + remaining[p]
+        if round_robin:
+            slice_end = now + time_quantum
+        elif mlfq:
+            slice_end = now + quanta[level[p]] - used[p]
+        elif cfs:
+            period = max(target_latency, (len(ready) + 1) * min_granularity)
+            slice_end = now + max(min_granularity, period * weight[p] // total_weight)
+        else:
+            return
+        stop_time = min(stop_time, slice_end)
+
+    def stop_running():
+        nonlocal running
+        p = running
+        ran = now - segment_start
+        remaining[p] -= ran
+        if mlfq:
+            used[p] += ran
+        elif cfs:
+            vruntime[p] += ran * NICE_0_WEIGHT / weight[p]
+        running = None
+        return p
+
+    now = 0.0
+    next_arrival = 0
+    completed = 0
+    running = last_run = None
+    segment_start = slice_end = stop_time = 0.0
+    switches = 0
+    disk_request = disk_done = None
+    cpu_busy = disk_busy = both_busy = 0.0
+    max_ready = max_disk = 0
+
+    while completed < n:
+        # Disk request (or head travel) finished
+        if disk_done is not None and disk_done <= now:
+            if disk_request is not None:
+                p = owner[disk_request]
+                phase[p] += 1
+                remaining[p] = bursts[p][phase[p]]
+                wake(p, False)
+            disk_request = disk_done = None
+
+        # CPU burst finished or quantum used up
+        expired = False
+        if running is not None and stop_time <= now:
+            # Same expression as the stop time, so the comparison is exact
+            if now >= segment_start + remaining[running]:
+                p = stop_running()
+                remaining[p] = 0.0
+                if cfs:
+                    total_weight -= weight[p]
+                if phase[p] == len(bursts[p]) - 1:
+                    completion[p] = now
+                    completed += 1
+                else:
+                    issued[p] = now
+                    disk.add(first_request[p] + phase[p])
+                    max_disk = max(max_disk, len(disk))
+            else:
+                expired = True
+
+        while next_arrival < n and arrival[order[next_arrival]] <= now:
+            wake(order[next_arrival], True)
+            next_arrival += 1
+
+        if mlfq and next_boost is not None and now >= next_boost:
+            # Priority boost: everyone back to level 0, in level order
+            for l in range(1, levels):
+                queues[0].extend(queues[l])
+                queues[l].clear()
+            if running is not None and level[running]:
+                # The running process starts a fresh level-0 quantum
+                p = stop_running()
+                level[p] = 0
+                used[p] = 0.0
+                ready_since[p] = now
+                dispatch(p)
+                expired = False
+            for p in range(n):
+                if level[p]:
+                    level[p] = 0
+                    used[p] = 0.0
+            while next_boost <= now:
+                next_boost += boost_interval
+
+        if expired:
+            if round_robin:
+                if ready:
+                    make_ready(stop_running())
+                else:
+                    # Nobody else is ready: keep running for another quantum
+                    slice_end += time_quantum
+                    stop_time = min(segment_start + remaining[running], slice_end)
+            else:
+                # MLFQ: down a level once the level's quantum is used up.
+                # Either way the next pick may well be the same process.
+                p = stop_running()
+                if mlfq:
+                    level[p] = min(level[p] + 1, levels - 1)
+                    used[p] = 0.0
+                make_ready(p)
+        if cfs and running is None and ready and ready[0][0] > min_vruntime:
+            # As in CPUScheduler.cfs, min_vruntime catches up when a slice ends
+            min_vruntime = ready[0][0]
+        max_ready = max(max_ready, waiting())
+
+        if disk_done is None and len(disk):
+            disk_request, disk_done = disk.next(now)
+            if disk_request is not None:
+                p = owner[disk_request]
+                io_wait[p] += now - issued[p]
+                io_time[p] += disk_done - now
+
+        if running is None and waiting():
+            dispatch(pop_ready())
+        elif preemptive and running is not None and ready:
+            current = key(running) - (now - segment_start if cpu_algorithm == 'SRTF' else 0)
+            if ready[0] < (current, running):
+                make_ready(stop_running())
+                dispatch(heapq.heappop(ready)[1])
+        elif mlfq and running is not None:
+            top = top_level()
+            if top is not None and top < level[running]:
+                # A process at a higher level preempts the running one
+                make_ready(stop_running())
+                dispatch(pop_ready())
+
+        # Jump to the next event, accounting for who was busy until then
+        upcoming = [t for t in (disk_done, stop_time if running is not None else None)
+                    if t is not None]
+        if next_arrival < n:
+            upcoming.append(arrival[order[next_arrival]])
+        if mlfq and next_boost is not None and upcoming:
+            upcoming.append(next_boost)
+        if not upcoming:
+            break
+        later = max(now, min(upcoming))
+        cpu_on = running is not None
+        disk_on = disk_done is not None
+        cpu_busy += (later - now) * cpu_on
+        disk_busy += (later - now) * disk_on
+        both_busy += (later - now) * (cpu_on and disk_on)
+        now = later
+
+    completion = np.array(completion)
+    arrival = np.array(arrival)
+    turnaround = completion - arrival
+    cpu_wait = np.array(cpu_wait)
+    io_wait = np.array(io_wait)
+    makespan = float(completion.max() - arrival.min()) if n else 0.0
+    result = {
+        'names': names,
+        'completion_time': completion,
+        'turnaround_time': turnaround,
+        'cpu_wait': cpu_wait,
+        'io_wait': io_wait,
+        'io_time': np.array(io_time),
+    }
+    result['summary'] = {
+        'processes': n,
+        'requests': len(cylinders),
+        'makespan': makespan,
+        'throughput': n * 1000.0 / makespan if makespan > 0 else None,
+        'cpu_utilization': cpu_busy / makespan if makespan > 0 else 0.0,
+        'disk_utilization': disk_busy / makespan if makespan > 0 else 0.0,
+        'overlap': both_busy / makespan if makespan > 0 else 0.0,
+        'avg_turnaround_time': float(turnaround.mean()) if n else 0.0,
+        'avg_cpu_wait': float(cpu_wait.mean()) if n else 0.0,
+        'avg_io_wait': float(io_wait.mean()) if n else 0.0,
+        'max_ready_queue': max_ready,
+        'max_disk_queue': max_disk,
+        'seek_distance': disk.seek_distance,
+        'context_switches': switches
+    }
+    return result
+
+
+def read_workload(path):
+    """Return (name, arrival, bursts, cylinders, priority) tuples from a workload file"""
+    from cli import _content_lines
+
+    processes = []
+    for line_no, line in _content_lines(path):
+        parts = line.replace(',', ' ').split()
+        try:
+            if len(parts) < 4 or len(parts) % 2:
+                raise ValueError("expected: Name Arrival Priority Burst [Cylinder Burst]...")
+            numbers = [int(x) for x in parts[1:]]
+            processes.append((parts[0], numbers[0], numbers[2::2], numbers[3::2], numbers[1]))
+        except ValueError as e:
+            raise ValueError(f"{path}:{line_no}: {e}") from None
+    return processes
+
+
+def main(argv=None):
+    from cli import algorithm_list, write_csv, write_jsonl
+
+    parser = argparse.ArgumentParser(
+        description="Run CPU/disk policy pairs over processes with CPU and I/O bursts.")
+    parser.add_argument('workloads', nargs='+', metavar='WORKLOAD', help="workload file")
+    parser.add_argument('-c', '--cpu-algorithms', default='FCFS',
+                        type=lambda v: algorithm_list(v, CPU_ALGORITHMS),
+                        help=f"comma separated list of {', '.join(CPU_ALGORITHMS)} or 'all'")
+    parser.add_argument('-d', '--disk-algorithms', default='FCFS',
+                        type=lambda v: algorithm_list(v, CLI_DISK_ALGORITHMS),
+                        help=f"comma separated list of {', '.join(CLI_DISK_ALGORITHMS)} or 'all'")
+    parser.add_argument('-q', '--quantum', type=float, default=2,
+                        help="Round Robin (and MLFQ level-0) time quantum in ms (default: 2)")
+    parser.add_argument('--head', type=int, default=0, help="head start position (default: 0)")
+    parser.add_argument('--disk-size', type=int, default=200,
+                        help="number of cylinders (default: 200)")
+    parser.add_argument('--head-speed', type=float, default=1.0,
+                        help="cylinders per ms (default: 1)")
+    parser.add_argument('--service-time', type=float, default=0.0,
+                        help="ms per request on top of the seek (default: 0)")
+    parser.add_argument('--step', type=int, default=10,
+                        help="group size for N-step SCAN (default: 10)")
+    parser.add_argument('-f', '--format', choices=('jsonl', 'csv'), default='jsonl')
+    parser.add_argument('-o', '--output', help="output file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    def records():
+        for path in args.workloads:
+            processes = read_workload(path)
+            for cpu_algorithm in args.cpu_algorithms:
+                for disk_algorithm in args.disk_algorithms:
+                    result = simulate(processes, cpu_algorithm, disk_algorithm, args.quantum,
+                                      args.head, args.head_speed, args.service_time,
+                                      args.disk_size, args.step)
+                    yield dict(workload=path, cpu_algorithm=cpu_algorithm,
+                               disk_algorithm=disk_algorithm, **result['summary'])
+
+    out = open(args.output, 'w', newline='') if args.output else sys.stdout
+    try:
+        if args.format == 'csv':
+            write_csv(records(), out, RESULT_FIELDS)
+        else:
+            write_jsonl(records(), out)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
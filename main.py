@@ -1,7 +1,5 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import sys
 import os
 
@@ -10,6 +8,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from cpu_scheduler import CPUScheduler
 from disk_scheduler import DiskScheduler
+from multicore import ALGORITHMS as MULTICORE_ALGORITHMS, run_multicore
 from utils import PlotUtils, InputValidator
 
 class SchedulerVisualizer:
@@ -29,6 +28,7 @@ class SchedulerVisualizer:
         # Create notebook for tabs
         notebook = ttk.Notebook(self.root)
         notebook.pack(fill='both', expand=True, padx=10, pady=10)
+        self.notebook = notebook
         
         # CPU Scheduler Tab
         cpu_frame = ttk.Frame(notebook)
@@ -40,6 +40,38 @@ class SchedulerVisualizer:
         
         self.setup_cpu_tab(cpu_frame)
         self.setup_disk_tab(disk_frame)
+        
+        # Charts (and matplotlib itself) are only created once their tab is shown
+        notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed)
+        self.root.after_idle(self.on_tab_changed)
+    
+    def on_tab_changed(self, event=None):
+        if self.notebook.index('current') == 0:
+            self.ensure_cpu_chart()
+        else:
+            self.ensure_disk_chart()
+    
+    def create_chart(self, parent, width, height, **pack_options):
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+        
+        fig, ax = PlotUtils.create_figure(parent, width, height)
+        canvas = FigureCanvasTkAgg(fig, parent)
+        # Zooming and panning with the toolbar re-renders the visible window
+        toolbar = NavigationToolbar2Tk(canvas, parent, pack_toolbar=False)
+        toolbar.update()
+        toolbar.pack(side='bottom', fill='x')
+        canvas.get_tk_widget().pack(fill='both', expand=True, **pack_options)
+        return fig, ax, canvas
+    
+    def ensure_cpu_chart(self):
+        if self.cpu_canvas is None:
+            self.cpu_fig, self.cpu_ax, self.cpu_canvas = self.create_chart(
+                self.cpu_chart_frame, 12, 6)
+    
+    def ensure_disk_chart(self):
+        if self.disk_canvas is None:
+            self.disk_fig, self.disk_ax, self.disk_canvas = self.create_chart(
+                self.disk_chart_frame, 10, 6, pady=10)
     
     def setup_cpu_tab(self, parent):
         # Main container with left and right panes
@@ -165,12 +197,14 @@ class SchedulerVisualizer:
             ("Shortest Remaining Time First (SRTF)", "SRTF"),
             ("Round Robin", "RR"),
             ("Priority Scheduling (Non-Preemptive)", "PRIORITY"),
-            ("Priority Scheduling (Preemptive)", "PRIORITY_P")
+            ("Priority Scheduling (Preemptive)", "PRIORITY_P"),
+            ("Multilevel Feedback Queue (MLFQ)", "MLFQ"),
+            ("Completely Fair Scheduler (CFS, Priority = Nice)", "CFS")
         ]
         
         for text, value in algorithms:
             ttk.Radiobutton(algo_frame, text=text, variable=self.cpu_algorithm, 
-                           value=value).pack(anchor='w', pady=2)
+                           value=value, command=self.on_cpu_algorithm_changed).pack(anchor='w', pady=2)
         
         # Time quantum for RR
         quantum_frame = ttk.Frame(algo_frame)
@@ -181,6 +215,31 @@ class SchedulerVisualizer:
         quantum_entry = ttk.Entry(quantum_frame, textvariable=self.quantum_var, width=5)
         quantum_entry.pack(side='left', padx=5)
         
+        # Number of CPUs; more than one runs the multi-core simulation
+        ttk.Label(quantum_frame, text="Cores:").pack(side='left', padx=(10, 0))
+        self.cores_var = tk.StringVar(value="1")
+        self.cores_spinbox = ttk.Spinbox(quantum_frame, from_=1, to=64, textvariable=self.cores_var,
+                                         width=4)
+        self.cores_spinbox.pack(side='left', padx=5)
+        
+        # Time lost on every context switch, drawn as overhead bars
+        ttk.Label(quantum_frame, text="Switch Cost:").pack(side='left', padx=(10, 0))
+        self.switch_cost_var = tk.StringVar(value="0")
+        self.switch_cost_entry = ttk.Entry(quantum_frame, textvariable=self.switch_cost_var, width=4)
+        self.switch_cost_entry.pack(side='left', padx=5)
+        self.cores_var.trace_add('write', self.on_cores_changed)
+        
+        # MLFQ levels and boost interval (level quanta are quantum * 2**level)
+        mlfq_frame = ttk.Frame(algo_frame)
+        mlfq_frame.pack(fill='x', pady=5)
+        
+        ttk.Label(mlfq_frame, text="MLFQ Levels:").pack(side='left')
+        self.mlfq_levels_var = tk.StringVar(value="3")
+        ttk.Entry(mlfq_frame, textvariable=self.mlfq_levels_var, width=4).pack(side='left', padx=5)
+        ttk.Label(mlfq_frame, text="Boost Every:").pack(side='left', padx=(10, 0))
+        self.mlfq_boost_var = tk.StringVar(value="50")
+        ttk.Entry(mlfq_frame, textvariable=self.mlfq_boost_var, width=5).pack(side='left', padx=5)
+        
         # Execute button
         ttk.Button(algo_frame, text="Run CPU Scheduling", 
                   command=self.run_cpu_scheduling, style='Accent.TButton').pack(pady=10)
@@ -189,9 +248,9 @@ class SchedulerVisualizer:
         chart_frame = ttk.LabelFrame(right_frame, text="Gantt Chart", padding=10)
         chart_frame.pack(fill='both', expand=True, padx=5, pady=5)
         
-        self.cpu_fig, self.cpu_ax = PlotUtils.create_figure(chart_frame, 12, 6)
-        self.cpu_canvas = FigureCanvasTkAgg(self.cpu_fig, chart_frame)
-        self.cpu_canvas.get_tk_widget().pack(fill='both', expand=True)
+        # Figure is created by ensure_cpu_chart() when the tab is first shown
+        self.cpu_chart_frame = chart_frame
+        self.cpu_fig = self.cpu_ax = self.cpu_canvas = None
         
         # Metrics section
         metrics_frame = ttk.LabelFrame(right_frame, text="Performance Metrics", padding=10)
@@ -227,6 +286,26 @@ class SchedulerVisualizer:
         # Add the sample processes automatically
         self.import_sample_processes()
     
+    def on_cpu_algorithm_changed(self):
+        # MLFQ and CFS only have single-core engines
+        if self.cpu_algorithm.get() in MULTICORE_ALGORITHMS:
+            self.cores_spinbox.state(['!disabled'])
+        else:
+            self.cores_var.set("1")
+            self.cores_spinbox.state(['disabled'])
+    
+    def on_cores_changed(self, *args):
+        # The multi-core simulation does not charge for context switches
+        try:
+            cores = int(self.cores_var.get())
+        except ValueError:
+            return
+        if cores > 1:
+            self.switch_cost_var.set("0")
+            self.switch_cost_entry.state(['disabled'])
+        else:
+            self.switch_cost_entry.state(['!disabled'])
+    
     def import_sample_processes(self):
         """Add the sample processes from the image automatically"""
         sample_processes = [
@@ -264,12 +343,26 @@ class SchedulerVisualizer:
         head_start_entry = ttk.Entry(left_frame, textvariable=self.head_start_var, width=10)
         head_start_entry.pack(anchor='w', pady=(0, 10))
         
+        # Disk geometry and N-step SCAN group size
+        options_frame = ttk.Frame(left_frame)
+        options_frame.pack(anchor='w', pady=(0, 10))
+        
+        ttk.Label(options_frame, text="Disk Size:").grid(row=0, column=0, sticky='w')
+        self.disk_size_var = tk.StringVar(value="200")
+        ttk.Entry(options_frame, textvariable=self.disk_size_var, width=8).grid(row=0, column=1, padx=5)
+        
+        ttk.Label(options_frame, text="N (N-Step):").grid(row=1, column=0, sticky='w')
+        self.n_step_var = tk.StringVar(value="4")
+        ttk.Entry(options_frame, textvariable=self.n_step_var, width=8).grid(row=1, column=1, padx=5)
+        
         # Algorithm selection
         ttk.Label(left_frame, text="Disk Scheduling Algorithm:", 
                  font=('Arial', 10, 'bold')).pack(anchor='w', pady=(10, 5))
         
         self.disk_algorithm = tk.StringVar(value="FCFS")
-        algorithms = [("FCFS", "FCFS"), ("SSTF", "SSTF"), ("SCAN", "SCAN"), ("C-SCAN", "CSCAN")]
+        algorithms = [("FCFS", "FCFS"), ("SSTF", "SSTF"), ("SCAN", "SCAN"), ("C-SCAN", "CSCAN"),
+                      ("LOOK", "LOOK"), ("C-LOOK", "CLOOK"), ("N-Step SCAN", "NSTEP"),
+                      ("FSCAN", "FSCAN")]
         
         for text, value in algorithms:
             ttk.Radiobutton(left_frame, text=text, variable=self.disk_algorithm, 
@@ -293,9 +386,9 @@ class SchedulerVisualizer:
         ttk.Label(right_frame, text="Disk Head Movement", 
                  font=('Arial', 12, 'bold')).pack(anchor='w')
         
-        self.disk_fig, self.disk_ax = PlotUtils.create_figure(right_frame, 10, 6)
-        self.disk_canvas = FigureCanvasTkAgg(self.disk_fig, right_frame)
-        self.disk_canvas.get_tk_widget().pack(fill='both', expand=True, pady=10)
+        # Figure is created by ensure_disk_chart() when the tab is first shown
+        self.disk_chart_frame = right_frame
+        self.disk_fig = self.disk_ax = self.disk_canvas = None
     
     def add_process_manual(self):
         try:
@@ -372,6 +465,7 @@ class SchedulerVisualizer:
             
             # Clear previous data
             self.cpu_scheduler.processes.clear()
+            self.cpu_scheduler.switch_cost = int(self.switch_cost_var.get() or 0)
             
             # Add processes
             for name, arrival, burst, priority in processes:
@@ -379,9 +473,16 @@ class SchedulerVisualizer:
             
             # Run selected algorithm
             algorithm = self.cpu_algorithm.get()
+            cores = int(self.cores_var.get())
             print(f"\n🎯 Running {algorithm} algorithm...")
             
-            if algorithm == "FCFS":
+            result = None
+            if cores > 1:
+                quantum = int(self.quantum_var.get()) if algorithm == "RR" else 2
+                result = run_multicore(self.cpu_scheduler, algorithm, cores, quantum)
+                gantt_chart = result['gantt']
+                title = f"{algorithm} on {cores} Cores"
+            elif algorithm == "FCFS":
                 gantt_chart = self.cpu_scheduler.fcfs()
                 title = "First Come First Serve (FCFS)"
             elif algorithm == "SJF":
@@ -404,17 +505,50 @@ class SchedulerVisualizer:
             elif algorithm == "PRIORITY_P":
                 gantt_chart = self.cpu_scheduler.priority_preemptive()
                 title = "Priority Scheduling - Preemptive"
+            elif algorithm == "MLFQ":
+                quantum = int(self.quantum_var.get())
+                levels = int(self.mlfq_levels_var.get())
+                boost = self.mlfq_boost_var.get().strip()
+                gantt_chart = self.cpu_scheduler.mlfq(levels, quantum,
+                                                      boost_interval=int(boost) if boost else None)
+                title = f"Multilevel Feedback Queue ({levels} Levels, Base Quantum={quantum})"
+            elif algorithm == "CFS":
+                gantt_chart = self.cpu_scheduler.cfs()
+                title = "Completely Fair Scheduler (CFS)"
             
-            print(f"📈 Gantt chart has {len(gantt_chart)} entries")
+            if result is None:
+                print(f"📈 Gantt chart has {len(gantt_chart)} entries")
+            else:
+                print(f"📈 Gantt charts have {sum(len(c) for c in gantt_chart)} entries on {cores} cores")
             
             # Update visualization with consistent colors
+            self.ensure_cpu_chart()
             PlotUtils.draw_cpu_gantt(self.cpu_ax, gantt_chart, title)
             self.cpu_canvas.draw()
+            # The new chart is the toolbar's home view
+            self.cpu_canvas.toolbar.update()
             
             # Calculate and display metrics
             print("📊 Calculating metrics...")
             metrics = self.cpu_scheduler.calculate_metrics(gantt_chart)
             self.update_metrics_table(metrics)
+            usage = metrics.get('_cpu')
+            if usage and result is None:
+                self.avg_label.config(text=self.avg_label.cget('text') +
+                                      f" | Context Switches: {usage['context_switches']} | "
+                                      f"Overhead: {usage['overhead_fraction']:.1%} | "
+                                      f"Effective Utilization: {usage['effective_utilization']:.1%}")
+            if algorithm == "MLFQ" and result is None:
+                levels_text = " | ".join(
+                    f"L{stats['level']}: {stats['cpu_share']:.0%} CPU, RT {stats['avg_response_time']:.2f}"
+                    for stats in self.cpu_scheduler.level_stats)
+                self.avg_label.config(text=self.avg_label.cget('text') + " | " + levels_text)
+            if result is not None:
+                utilization = sum(result['utilization']) / cores
+                self.avg_label.config(text=self.avg_label.cget('text') +
+                                      f" | Utilization: {utilization:.1%} | "
+                                      f"Migrations: {result['migrations']} | "
+                                      f"Imbalance: {result['imbalance']:.1%}")
             
         except Exception as e:
             print(f"❌ Error in run_cpu_scheduling: {e}")
@@ -437,7 +571,7 @@ class SchedulerVisualizer:
         print(f"📋 Updating metrics table with {len(metrics)} entries")
         
         for process, data in metrics.items():
-            if process == '_averages':
+            if process in ('_averages', '_summary', '_cpu'):
                 continue
                 
             try:
@@ -519,6 +653,7 @@ class SchedulerVisualizer:
             
             # Set requests
             self.disk_scheduler.set_requests(requests, head_start)
+            disk_size = int(self.disk_size_var.get())
             
             # Run selected algorithm
             algorithm = self.disk_algorithm.get()
@@ -530,24 +665,42 @@ class SchedulerVisualizer:
                 sequence = self.disk_scheduler.sstf()
                 title = "SSTF Disk Scheduling"
             elif algorithm == "SCAN":
-                sequence = self.disk_scheduler.scan()
+                sequence = self.disk_scheduler.scan(disk_size)
                 title = "SCAN Disk Scheduling"
             elif algorithm == "CSCAN":
-                sequence = self.disk_scheduler.c_scan()
+                sequence = self.disk_scheduler.c_scan(disk_size)
                 title = "C-SCAN Disk Scheduling"
+            elif algorithm == "LOOK":
+                sequence = self.disk_scheduler.look()
+                title = "LOOK Disk Scheduling"
+            elif algorithm == "CLOOK":
+                sequence = self.disk_scheduler.c_look()
+                title = "C-LOOK Disk Scheduling"
+            elif algorithm == "NSTEP":
+                step = int(self.n_step_var.get())
+                sequence = self.disk_scheduler.n_step_scan(disk_size, step)
+                title = f"N-Step SCAN (N={step}) Disk Scheduling"
+            elif algorithm == "FSCAN":
+                sequence = self.disk_scheduler.fscan(disk_size)
+                title = "FSCAN Disk Scheduling"
             
             # Calculate seek time
             seek_time = self.disk_scheduler.calculate_seek_time(sequence)
             
             # Update visualization
+            self.ensure_disk_chart()
             PlotUtils.draw_disk_sequence(self.disk_ax, sequence[1:], head_start, title)
             self.disk_canvas.draw()
+            # The new chart is the toolbar's home view
+            self.disk_canvas.toolbar.update()
             
             # Update results text
             results_text = f"Algorithm: {title}\n"
             results_text += f"Sequence: {' -> '.join(map(str, sequence))}\n"
             results_text += f"Total Seek Time: {seek_time}\n"
             results_text += f"Total Requests: {len(requests)}\n"
+            if self.disk_scheduler.max_bypassed is not None:
+                results_text += f"Max Bypassed in a Sweep: {self.disk_scheduler.max_bypassed}\n"
             
             self.disk_results.delete("1.0", tk.END)
             self.disk_results.insert("1.0", results_text)
@@ -0,0 +1,283 @@
+import heapq
+from collections import deque
+
+from gantt import GanttChart
+
+ALGORITHMS = ('FCFS', 'SJF', 'SRTF', 'RR', 'PRIORITY', 'PRIORITY_P')
+QUEUE_MODES = ('global', 'per-core')
+
+
+def _allowed_cores(affinity, names, cores):
+    """Per-process tuple of allowed cores (None = any) from a name -> mask map.
+
+    A mask is either an int bit mask (bit i = core i) or an iterable of
+    core numbers.
+    """
+    allowed = [None] * len(names)
+    if not affinity:
+        return allowed
+    index = {name: i for i, name in enumerate(names)}
+    for name, mask in affinity.items():
+        if name not in index:
+            raise ValueError(f"affinity given for unknown process {name!r}")
+        if isinstance(mask, int):
+            mask = [c for c in range(cores) if mask >> c & 1]
+        mask = tuple(sorted(set(mask)))
+        if not mask or mask[0] < 0 or mask[-1] >= cores:
+            raise ValueError(f"affinity of {name!r} must name cores in 0..{cores - 1}")
+        allowed[index[name]] = None if len(mask) == cores else mask
+    return allowed
+
+
+def run_multicore(scheduler, algorithm='FCFS', cores=2, time_quantum=2, queues='global',
+                  balance_interval=None, affinity=None):
+    """Run one of the CPUScheduler policies on ``cores`` identical CPUs.
+
+    With ``queues='global'`` every idle core takes the best ready process it
+    is allowed to run. With ``queues='per-core'`` each arrival joins the
+    least loaded allowed core's run queue, idle cores steal from the
+    longest queue, and every ``balance_interval`` time units (if given)
+    processes are migrated until queue lengths differ by at most one.
+    ``affinity`` maps process names to allowed cores (see _allowed_cores).
+
+    Completion and first-execution times are written back into the
+    scheduler's table, so ``scheduler.calculate_metrics`` works as usual.
+    Returns a dict with one GanttChart per core (``'gantt'``), per-core
+    ``busy_time`` and ``utilization``, the number of ``migrations`` (a
+    process resuming on a different core), ``imbalance`` (busiest core's
+    busy time over the mean, minus one) and the ``makespan``.
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown CPU algorithm: {algorithm}")
+    if queues not in QUEUE_MODES:
+        raise ValueError(f"Unknown queue mode: {queues}")
+    if cores < 1:
+        raise ValueError("cores must be at least 1")
+    if algorithm == 'RR' and time_quantum <= 0:
+        raise ValueError("time_quantum must be positive")
+    if balance_interval is not None and balance_interval <= 0:
+        raise ValueError("balance_interval must be positive")
+
+    table = scheduler.processes
+    names = table.names
+    charts = [GanttChart(names) for _ in range(cores)]
+    n = len(table)
+    if not n:
+        return {'gantt': charts, 'busy_time': [0] * cores, 'utilization': [0.0] * cores,
+                'migrations': 0, 'imbalance': 0.0, 'makespan': 0}
+
+    scheduler.reset_processes()
+    arrival = table.column('arrival_time').tolist()
+    remaining = table.column('burst_time').tolist()
+    key_name = {'SJF': 'burst_time', 'SRTF': 'remaining_time',
+                'PRIORITY': 'priority', 'PRIORITY_P': 'priority'}.get(algorithm)
+    fifo = key_name is None
+    # SRTF keys on the live remaining times, the others on a fixed column
+    keys = None if fifo else (remaining if key_name == 'remaining_time'
+                              else table.column(key_name).tolist())
+    preemptive = algorithm in ('SRTF', 'PRIORITY_P')
+    round_robin = algorithm == 'RR'
+    allowed = _allowed_cores(affinity, names, cores)
+    per_core = queues == 'per-core'
+
+    start = [-1] * n
+    completion = [-1] * n
+    last_core = [-1] * n
+    order = scheduler._arrival_order(arrival)
+    ready = [deque() if fifo else [] for _ in range(cores if per_core else 1)]
+    running = [None] * cores
+    segment_start = [0] * cores
+    slice_end = [0] * cores
+    # Lazily invalidated heap of (stop time, core, dispatch number)
+    stops = []
+    dispatch_id = [0] * cores
+    busy = [0] * cores
+    migrations = 0
+
+    def run_key(i):
+        return (keys[i], i)
+
+    def live_key(core):
+        # A running SRTF process is keyed on its remaining time as of now
+        i = running[core]
+        if key_name == 'remaining_time':
+            return (remaining[i] - (now - segment_start[core]), i)
+        return (keys[i], i)
+
+    def enqueue(queue, i):
+        if fifo:
+            queue.append(i)
+        else:
+            heapq.heappush(queue, (keys[i], i))
+
+    def take(queue, core):
+        """Remove and return the best process in ``queue`` allowed on ``core``"""
+        skipped = []
+        found = None
+        while queue:
+            i = queue.popleft() if fifo else heapq.heappop(queue)[1]
+            if allowed[i] is None or core in allowed[i]:
+                found = i
+                break
+            skipped.append(i)
+        if fifo:
+            queue.extendleft(reversed(skipped))
+        else:
+            for i in skipped:
+                heapq.heappush(queue, (keys[i], i))
+        return found
+
+    def has_runnable(queue, core):
+        if not queue:
+            return False
+        if fifo:
+            return any(allowed[i] is None or core in allowed[i] for i in queue)
+        return any(allowed[i] is None or core in allowed[i] for _, i in queue)
+
+    def dispatch(core, i, now):
+        nonlocal migrations
+        if last_core[i] not in (-1, core):
+            migrations += 1
+        last_core[i] = core
+        running[core] = i
+        segment_start[core] = now
+        if start[i] == -1:
+            start[i] = now
+        stop = now + remaining[i]
+        if round_robin:
+            slice_end[core] = now + time_quantum
+            stop = min(stop, slice_end[core])
+        dispatch_id[core] += 1
+        heapq.heappush(stops, (stop, core, dispatch_id[core]))
+
+    def stop_running(core, now):
+        """Take the running process off ``core``, recording its segment"""
+        i = running[core]
+        remaining[i] -= now - segment_start[core]
+        busy[core] += now - segment_start[core]
+        charts[core].append(i, segment_start[core], now)
+        running[core] = None
+        dispatch_id[core] += 1
+        return i
+
+    def load(core):
+        return len(ready[core]) + (running[core] is not None)
+
+    def steal(core):
+        """Take a process for idle ``core`` from the longest other run queue"""
+        for victim in sorted(range(cores), key=lambda c: -len(ready[c])):
+            if victim != core and ready[victim]:
+                i = take(ready[victim], core)
+                if i is not None:
+                    return i
+        return None
+
+    def balance():
+        while True:
+            loads = [load(c) for c in range(cores)]
+            src = max(range(cores), key=loads.__getitem__)
+            dst = min(range(cores), key=loads.__getitem__)
+            if loads[src] - loads[dst] <= 1:
+                return
+            i = take(ready[src], dst)
+            if i is None:
+                return
+            enqueue(ready[dst], i)
+
+    now = 0
+    next_arrival = 0
+    completed = 0
+    next_balance = balance_interval if per_core and balance_interval else None
+
+    while completed < n:
+        # Processes that finish or run out of quantum now
+        expired = []
+        while stops and stops[0][0] <= now:
+            _, core, token = heapq.heappop(stops)
+            if token != dispatch_id[core]:
+                continue
+            i = running[core]
+            if remaining[i] - (now - segment_start[core]) == 0:
+                stop_running(core, now)
+                completion[i] = now
+                completed += 1
+            else:
+                expired.append(core)
+
+        # Admit everything that has arrived by now
+        while next_arrival < n and arrival[order[next_arrival]] <= now:
+            i = order[next_arrival]
+            next_arrival += 1
+            if per_core:
+                candidates = allowed[i] if allowed[i] is not None else range(cores)
+                enqueue(ready[min(candidates, key=load)], i)
+            else:
+                enqueue(ready[0], i)
+
+        # Round Robin: requeue behind the new arrivals, unless nobody else can run here
+        for core in expired:
+            queue = ready[core if per_core else 0]
+            if has_runnable(queue, core):
+                enqueue(queue, stop_running(core, now))
+            else:
+                slice_end[core] += time_quantum
+                stop = min(now + remaining[running[core]] - (now - segment_start[core]),
+                           slice_end[core])
+                heapq.heappush(stops, (stop, core, dispatch_id[core]))
+
+        if next_balance is not None and now >= next_balance:
+            balance()
+            next_balance = (now // balance_interval + 1) * balance_interval
+
+        # Fill idle cores, then let better processes preempt running ones
+        for core in range(cores):
+            if running[core] is None:
+                queue = ready[core] if per_core else ready[0]
+                i = take(queue, core)
+                if i is None and per_core:
+                    i = steal(core)
+                if i is not None:
+                    dispatch(core, i, now)
+
+        if preemptive:
+            # Worst running process first, so it is the one that gets preempted
+            for core in sorted((c for c in range(cores) if running[c] is not None),
+                               key=live_key, reverse=True):
+                queue = ready[core] if per_core else ready[0]
+                current = live_key(core)
+                if not queue or queue[0] >= current:
+                    continue
+                best = take(queue, core)
+                if best is None:
+                    continue
+                if run_key(best) >= current:
+                    enqueue(queue, best)
+                    continue
+                enqueue(queue, stop_running(core, now))
+                dispatch(core, best, now)
+
+        # Jump to the next event
+        upcoming = []
+        while stops and stops[0][2] != dispatch_id[stops[0][1]]:
+            heapq.heappop(stops)
+        if stops:
+            upcoming.append(stops[0][0])
+        if next_arrival < n:
+            upcoming.append(arrival[order[next_arrival]])
+        if next_balance is not None and any(ready):
+            upcoming.append(next_balance)
+        if not upcoming:
+            break
+        now = max(now, min(upcoming))
+
+    scheduler._store_schedule(start, completion)
+    makespan = max(completion)
+    mean_busy = sum(busy) / cores
+    return {
+        'gantt': charts,
+        'busy_time': busy,
+        'utilization': [b / makespan if makespan else 0.0 for b in busy],
+        'migrations': migrations,
+        'imbalance': max(busy) / mean_busy - 1 if mean_busy else 0.0,
+        'makespan': makespan
+    }
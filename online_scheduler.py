@@ -0,0 +1,193 @@
+import heapq
+from collections import deque
+
+ALGORITHMS = ('FCFS', 'SJF', 'SRTF', 'RR', 'PRIORITY', 'PRIORITY_P')
+
+
+class _Job:
+    __slots__ = ('seq', 'name', 'arrival_time', 'burst_time', 'priority',
+                 'remaining_time', 'first_execution')
+
+    def __init__(self, seq, name, arrival_time, burst_time, priority):
+        self.seq = seq
+        self.name = name
+        self.arrival_time = arrival_time
+        self.burst_time = burst_time
+        self.priority = priority
+        self.remaining_time = burst_time
+        self.first_execution = -1
+
+
+class OnlineScheduler:
+    """Incremental CPU scheduler fed by a stream of arrivals.
+
+    Processes are submitted as they arrive (in non-decreasing arrival order)
+    and ``advance()`` moves the clock forward, yielding events as they
+    happen:
+
+        ('segment', name, start, end)      a finished Gantt chart segment
+        ('complete', name, metrics)        a process finished; metrics holds
+                                           the same fields calculate_metrics
+                                           reports per process
+
+    Only processes that have been submitted but not completed are kept, so
+    memory is bounded by the number of live processes rather than the length
+    of the trace. For arrival-sorted input the segments match the batch
+    algorithms in CPUScheduler, including their tie-breaking and the merging
+    of back-to-back quanta of the same process.
+    """
+
+    def __init__(self, algorithm='FCFS', time_quantum=2):
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown CPU algorithm: {algorithm}")
+        if algorithm == 'RR' and time_quantum <= 0:
+            raise ValueError("time_quantum must be positive")
+        self.algorithm = algorithm
+        self.time_quantum = time_quantum
+        self.preemptive = algorithm in ('SRTF', 'PRIORITY_P')
+        self._key = {'SJF': 'burst_time', 'SRTF': 'remaining_time',
+                     'PRIORITY': 'priority', 'PRIORITY_P': 'priority'}.get(algorithm)
+
+        self.clock = 0
+        self._seq = 0
+        self._last_arrival = None
+        self._incoming = deque()
+        # FCFS/RR use a FIFO, the others a heap of (key, seq, job)
+        self._ready = deque() if self._key is None else []
+        self._current = None
+        self._segment_start = 0
+        self._slice_end = 0
+
+        self.completed = 0
+        self.total_turnaround_time = 0
+        self.total_waiting_time = 0
+        self.total_response_time = 0
+
+    def __len__(self):
+        """Number of live (submitted, not yet completed) processes"""
+        return len(self._incoming) + len(self._ready) + (self._current is not None)
+
+    def submit(self, name, arrival_time, burst_time, priority=0):
+        if self._last_arrival is not None and arrival_time < self._last_arrival:
+            raise ValueError("processes must be submitted in arrival order")
+        if arrival_time < self.clock:
+            raise ValueError(f"arrival time {arrival_time} is before the clock ({self.clock})")
+        self._last_arrival = arrival_time
+        self._incoming.append(_Job(self._seq, name, arrival_time, burst_time, priority))
+        self._seq += 1
+
+    def _admit(self):
+        incoming = self._incoming
+        ready = self._ready
+        key = self._key
+        while incoming and incoming[0].arrival_time <= self.clock:
+            job = incoming.popleft()
+            if key is None:
+                ready.append(job)
+            else:
+                heapq.heappush(ready, (getattr(job, key), job.seq, job))
+
+    def _complete(self, job):
+        turnaround_time = self.clock - job.arrival_time
+        waiting_time = max(0, turnaround_time - job.burst_time)
+        response_time = max(0, job.first_execution - job.arrival_time)
+        self.completed += 1
+        self.total_turnaround_time += turnaround_time
+        self.total_waiting_time += waiting_time
+        self.total_response_time += response_time
+        return ('complete', job.name, {
+            'arrival_time': job.arrival_time,
+            'burst_time': job.burst_time,
+            'priority': job.priority,
+            'completion_time': self.clock,
+            'turnaround_time': turnaround_time,
+            'waiting_time': waiting_time,
+            'response_time': response_time
+        })
+
+    def advance(self, until=None):
+        """Run the simulation up to time ``until`` and yield the events.
+
+        No scheduling decision is taken at ``until`` itself, so processes
+        arriving exactly then can still be submitted afterwards. With
+        ``until=None`` the scheduler runs until every submitted process has
+        completed.
+        """
+        ready = self._ready
+        incoming = self._incoming
+        key = self._key
+        round_robin = self.algorithm == 'RR'
+
+        while True:
+            self._admit()
+            if until is not None and self.clock >= until:
+                return
+
+            job = self._current
+            if job is None:
+                if not ready:
+                    if incoming:
+                        # CPU is idle, skip straight to the next arrival
+                        next_arrival = incoming[0].arrival_time
+                        self.clock = next_arrival if until is None else min(next_arrival, until)
+                        continue
+                    if until is not None:
+                        self.clock = until
+                    return
+
+                job = ready.popleft() if key is None else heapq.heappop(ready)[2]
+                self._current = job
+                self._segment_start = self.clock
+                self._slice_end = self.clock + self.time_quantum
+                if job.first_execution == -1:
+                    job.first_execution = self.clock
+            elif self.preemptive and ready and ready[0][:2] < (getattr(job, key), job.seq):
+                # A newly arrived process beats the running one
+                yield ('segment', job.name, self._segment_start, self.clock)
+                heapq.heappush(ready, (getattr(job, key), job.seq, job))
+                self._current = None
+                continue
+            elif round_robin and self.clock == self._slice_end:
+                if not ready:
+                    # Nobody else is waiting: keep running in the same segment
+                    self._slice_end += self.time_quantum
+                    continue
+                # Quantum expired; arrivals admitted above queue ahead of it
+                yield ('segment', job.name, self._segment_start, self.clock)
+                ready.append(job)
+                self._current = None
+                continue
+
+            stop = self.clock + job.remaining_time
+            if round_robin:
+                stop = min(stop, self._slice_end)
+            if self.preemptive and incoming:
+                stop = min(stop, incoming[0].arrival_time)
+            if until is not None:
+                stop = min(stop, until)
+
+            job.remaining_time -= stop - self.clock
+            self.clock = stop
+            if job.remaining_time == 0:
+                yield ('segment', job.name, self._segment_start, self.clock)
+                yield self._complete(job)
+                self._current = None
+
+    def run(self, processes):
+        """Feed an arrival-ordered iterable of (name, arrival, burst[, priority])
+        and yield every event, pulling arrivals only as the clock reaches them.
+        """
+        for process in processes:
+            yield from self.advance(process[1])
+            self.submit(*process)
+        yield from self.advance()
+
+    def averages(self):
+        """Running average TAT/WT/RT over the processes completed so far"""
+        if not self.completed:
+            return {}
+        return {
+            'avg_turnaround_time': self.total_turnaround_time / self.completed,
+            'avg_waiting_time': self.total_waiting_time / self.completed,
+            'avg_response_time': self.total_response_time / self.completed
+        }
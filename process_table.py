@@ -0,0 +1,153 @@
+import numpy as np
+
+COLUMNS = ('arrival_time', 'burst_time', 'remaining_time', 'priority',
+           'start_time', 'completion_time', 'first_execution')
+
+
+class ProcessTable:
+    """Struct-of-arrays storage for CPU processes.
+
+    Each numeric field lives in its own int64 column and names are kept in a
+    plain list, so a process costs a few dozen bytes instead of a dict.
+    Iterating or indexing the table yields ProcessRow views for code that
+    still wants one object per process.
+    """
+
+    def __init__(self, capacity=16):
+        self.names = []
+        self._size = 0
+        self._index = None
+        self._columns = {col: np.empty(capacity, dtype=np.int64) for col in COLUMNS}
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        for i in range(self._size):
+            yield ProcessRow(self, i)
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self._size
+        if not 0 <= i < self._size:
+            raise IndexError("process index out of range")
+        return ProcessRow(self, i)
+
+    def column(self, name):
+        """Return a writable view of column ``name`` trimmed to the table size"""
+        return self._columns[name][:self._size]
+
+    def append(self, name, arrival_time, burst_time, priority=0):
+        if self._size == len(self._columns['arrival_time']):
+            self._grow(2 * self._size)
+        i = self._size
+        columns = self._columns
+        columns['arrival_time'][i] = arrival_time
+        columns['burst_time'][i] = burst_time
+        columns['remaining_time'][i] = burst_time
+        columns['priority'][i] = priority
+        columns['start_time'][i] = -1
+        columns['completion_time'][i] = -1
+        columns['first_execution'][i] = -1
+        self.names.append(name)
+        self._size += 1
+        if self._index is not None:
+            self._index.setdefault(name, i)
+        return i
+
+    def extend(self, names, arrival_time, burst_time, priority=None):
+        """Append many processes at once from sequences or arrays"""
+        arrival_time = np.asarray(arrival_time, dtype=np.int64)
+        burst_time = np.asarray(burst_time, dtype=np.int64)
+        count = len(arrival_time)
+        if len(names) != count or len(burst_time) != count:
+            raise ValueError("names, arrival_time and burst_time must have the same length")
+
+        start, end = self._size, self._size + count
+        if end > len(self._columns['arrival_time']):
+            self._grow(max(end, 2 * self._size))
+        columns = self._columns
+        columns['arrival_time'][start:end] = arrival_time
+        columns['burst_time'][start:end] = burst_time
+        columns['remaining_time'][start:end] = burst_time
+        columns['priority'][start:end] = 0 if priority is None else priority
+        columns['start_time'][start:end] = -1
+        columns['completion_time'][start:end] = -1
+        columns['first_execution'][start:end] = -1
+        self.names.extend(names)
+        self._size = end
+        self._index = None
+
+    def clear(self):
+        self.names = []
+        self._size = 0
+        self._index = None
+
+    def index_of(self, name):
+        """Index of the first process called ``name``, or -1"""
+        if self._index is None:
+            # Built on first lookup so bulk loads don't pay for it
+            self._index = {}
+            for i, process_name in enumerate(self.names):
+                self._index.setdefault(process_name, i)
+        return self._index.get(name, -1)
+
+    def _grow(self, capacity):
+        capacity = max(capacity, 16)
+        for col, data in self._columns.items():
+            grown = np.empty(capacity, dtype=np.int64)
+            grown[:self._size] = data[:self._size]
+            self._columns[col] = grown
+
+
+class ProcessRow:
+    """Lightweight view of one row of a ProcessTable.
+
+    Supports the same ``process['key']`` access as the old per-process
+    dicts, reading and writing straight through to the table columns.
+    """
+
+    __slots__ = ('table', 'index')
+
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+
+    @property
+    def name(self):
+        return self.table.names[self.index]
+
+    def __getitem__(self, key):
+        if key == 'name':
+            return self.name
+        return int(self.table._columns[key][self.index])
+
+    def __setitem__(self, key, value):
+        if key == 'name':
+            self.table.names[self.index] = value
+            self.table._index = None
+        else:
+            self.table._columns[key][self.index] = value
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return ('name',) + COLUMNS
+
+    def to_dict(self):
+        return {key: self[key] for key in self.keys()}
+
+    def __eq__(self, other):
+        if not isinstance(other, ProcessRow):
+            return NotImplemented
+        return self.table is other.table and self.index == other.index
+
+    def __hash__(self):
+        return hash((id(self.table), self.index))
+
+    def __repr__(self):
+        return f"ProcessRow({self.to_dict()})"
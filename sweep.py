@@ -0,0 +1,237 @@
+"""Parallel parameter sweeps over CPU scheduling runs.
+
+Runs every combination of workload file x algorithm x Round Robin quantum on
+a process pool and reports average TAT/WT/RT, the number of context
+switches, switching overhead, effective utilization and throughput for each
+run. With ``--switch-cost`` every context switch costs CPU time, and
+``--peaks`` reports only the quantum with the highest throughput for each
+workload and algorithm. Each workload is loaded once into a shared memory
+block, so tasks only carry a small handle instead of the pickled process
+list.
+
+    python sweep.py jobs1.txt jobs2.txt -a RR,SRTF -q 1:16 --switch-cost 1 -j 8 -f csv
+    python sweep.py jobs.txt -a RR,MLFQ -q 1:32 --switch-cost 1 --peaks
+"""
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from cli import (CPU_ALGORITHMS, algorithm_list, read_cpu_workload, run_cpu,
+                 write_csv, write_jsonl)
+from cpu_scheduler import CPUScheduler
+
+RESULT_FIELDS = ('workload', 'algorithm', 'quantum', 'switch_cost', 'processes',
+                 'avg_turnaround_time', 'avg_waiting_time', 'avg_response_time',
+                 'context_switches', 'overhead_fraction', 'effective_utilization',
+                 'throughput', 'makespan')
+
+
+class SharedWorkload:
+    """A CPU workload packed into one shared memory block.
+
+    The block holds arrival, burst and priority as three int64 rows followed
+    by the process names joined with newlines. ``handle`` is all a worker
+    needs to attach to it.
+    """
+
+    def __init__(self, names, arrival_times, burst_times, priorities):
+        count = len(names)
+        blob = '\n'.join(names).encode()
+        self.shm = shared_memory.SharedMemory(create=True, size=max(1, 24 * count + len(blob)))
+        columns = np.ndarray((3, count), dtype=np.int64, buffer=self.shm.buf)
+        columns[0] = arrival_times
+        columns[1] = burst_times
+        columns[2] = priorities
+        del columns
+        self.shm.buf[24 * count:24 * count + len(blob)] = blob
+        self.handle = (self.shm.name, count, len(blob))
+
+    @classmethod
+    def from_file(cls, path):
+        rows = list(read_cpu_workload(path))
+        return cls([r[0] for r in rows], [r[1] for r in rows],
+                   [r[2] for r in rows], [r[3] for r in rows])
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+
+def _attach(name):
+    try:
+        # Python 3.13+: the parent owns the block, so don't track it here
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+# Per-worker cache of the most recently used workload: (shm name, shm, scheduler)
+_loaded = None
+
+
+def _scheduler_for(handle):
+    global _loaded
+    name, count, names_size = handle
+    if _loaded is not None and _loaded[0] == name:
+        return _loaded[2]
+    if _loaded is not None:
+        _loaded[1].close()
+
+    shm = _attach(name)
+    columns = np.ndarray((3, count), dtype=np.int64, buffer=shm.buf)
+    names = bytes(shm.buf[24 * count:24 * count + names_size]).decode().split('\n') if count else []
+    scheduler = CPUScheduler()
+    scheduler.add_processes(names, columns[0], columns[1], columns[2])
+    del columns
+    _loaded = (name, shm, scheduler)
+    return scheduler
+
+
+def run_one(task):
+    """Run a single grid point; ``task`` is (handle, workload, algorithm, quantum, switch_cost)"""
+    handle, workload, algorithm, quantum, switch_cost = task
+    scheduler = _scheduler_for(handle)
+    scheduler.switch_cost = switch_cost
+    if quantum is None:
+        gantt_chart = run_cpu(scheduler, algorithm)
+    else:
+        gantt_chart = run_cpu(scheduler, algorithm, quantum)
+    metrics = scheduler.calculate_metrics(gantt_chart, aggregate_only=True)
+    averages = metrics.get('_averages', {})
+    usage = metrics.get('_cpu') or scheduler.cpu_usage(gantt_chart)
+    return {
+        'workload': workload,
+        'algorithm': algorithm,
+        'quantum': quantum,
+        'switch_cost': switch_cost,
+        'processes': len(scheduler.processes),
+        'avg_turnaround_time': averages.get('avg_turnaround_time'),
+        'avg_waiting_time': averages.get('avg_waiting_time'),
+        'avg_response_time': averages.get('avg_response_time'),
+        'context_switches': usage['context_switches'],
+        'overhead_fraction': usage['overhead_fraction'],
+        'effective_utilization': usage['effective_utilization'],
+        'throughput': usage['throughput'],
+        'makespan': gantt_chart[-1][2] if gantt_chart else 0
+    }
+
+
+def grid(workloads, algorithms, quanta):
+    """Yield (workload, algorithm, quantum); quantum is None unless the algorithm takes one"""
+    for workload in workloads:
+        for algorithm in algorithms:
+            if algorithm in ('RR', 'MLFQ'):
+                for quantum in quanta:
+                    yield workload, algorithm, quantum
+            else:
+                yield workload, algorithm, None
+
+
+def run_sweep(workloads, algorithms=('RR',), quanta=(2,), workers=None, switch_cost=0):
+    """Run the whole grid and return one result dict per run, in grid order.
+
+    ``workers`` defaults to the number of CPUs; 1 runs everything in this
+    process.
+    """
+    workers = workers or os.cpu_count() or 1
+    shared = {}
+    try:
+        for workload in workloads:
+            if workload not in shared:
+                shared[workload] = SharedWorkload.from_file(workload)
+        tasks = [(shared[w].handle, w, a, q, switch_cost)
+                 for w, a, q in grid(workloads, algorithms, quanta)]
+
+        if workers == 1 or len(tasks) == 1:
+            return [run_one(task) for task in tasks]
+
+        # Tasks are grouped by workload, so chunks mostly reuse a worker's loaded table
+        chunksize = max(1, len(tasks) // (4 * workers))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(run_one, tasks, chunksize=chunksize))
+    finally:
+        global _loaded
+        if _loaded is not None:
+            _loaded[1].close()
+            _loaded = None
+        for workload in shared.values():
+            workload.close()
+
+
+def throughput_peaks(results):
+    """The run with the highest throughput for each (workload, algorithm), in grid order.
+
+    Ties go to the smaller quantum. Algorithms without a quantum have a
+    single run, which is returned as is.
+    """
+    peaks = {}
+    for result in results:
+        key = (result['workload'], result['algorithm'])
+        best = peaks.get(key)
+        if best is None or result['throughput'] > best['throughput'] or (
+                result['throughput'] == best['throughput']
+                and result['quantum'] is not None and result['quantum'] < best['quantum']):
+            peaks[key] = result
+    return list(peaks.values())
+
+
+def _quantum_list(value):
+    """Parse '1,2,4' or 'start:stop[:step]' (stop inclusive)"""
+    quanta = []
+    for part in value.split(','):
+        if ':' in part:
+            bounds = [int(x) for x in part.split(':')]
+            step = bounds[2] if len(bounds) > 2 else 1
+            quanta.extend(range(bounds[0], bounds[1] + 1, step))
+        elif part.strip():
+            quanta.append(int(part))
+    if not quanta or min(quanta) <= 0:
+        raise argparse.ArgumentTypeError("quantum values must be positive integers")
+    return quanta
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep CPU scheduling parameters in parallel.")
+    parser.add_argument('workloads', nargs='+', metavar='WORKLOAD', help="CPU workload file")
+    parser.add_argument('-a', '--algorithms', default='RR',
+                        type=lambda v: algorithm_list(v, CPU_ALGORITHMS),
+                        help=f"comma separated list of {', '.join(CPU_ALGORITHMS)} or 'all'")
+    parser.add_argument('-q', '--quanta', default='2', type=_quantum_list,
+                        help="Round Robin (and MLFQ level-0) quanta, e.g. '1,2,4' or '1:16' (default: 2)")
+    parser.add_argument('--switch-cost', type=int, default=0,
+                        help="time units lost on every context switch (default: 0)")
+    parser.add_argument('-p', '--peaks', action='store_true',
+                        help="only report the highest-throughput quantum per workload and algorithm")
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help="worker processes (default: number of CPUs)")
+    parser.add_argument('-f', '--format', choices=('jsonl', 'csv'), default='jsonl')
+    parser.add_argument('-o', '--output', help="output file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    try:
+        results = run_sweep(args.workloads, args.algorithms, args.quanta, args.workers,
+                            args.switch_cost)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    if args.peaks:
+        results = throughput_peaks(results)
+
+    out = open(args.output, 'w', newline='') if args.output else sys.stdout
+    try:
+        if args.format == 'csv':
+            write_csv(results, out, RESULT_FIELDS)
+        else:
+            write_jsonl(results, out)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
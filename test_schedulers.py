@@ -0,0 +1,436 @@
+"""Regression tests for the scheduling engines.
+
+Each engine rewrite is checked against a small reference implementation of
+the behaviour it replaced (the original list-based code, tie-breaking
+included), or against another engine that must agree with it.
+
+    python -m pytest -q test_schedulers.py
+"""
+import heapq
+import random
+
+import pytest
+
+from cli import CPU_ALGORITHMS, run_cpu, run_disk
+from cpu_scheduler import CPUScheduler
+from disk_model import DiskModel
+from disk_scheduler import DiskScheduler
+from disk_simulation import ALGORITHMS as TIMED_DISK_ALGORITHMS, simulate as simulate_disk
+from gantt import OVERHEAD_NAME
+from io_simulation import CPU_ALGORITHMS as IO_CPU_ALGORITHMS, simulate as simulate_io
+from multicore import ALGORITHMS as MULTICORE_ALGORITHMS, QUEUE_MODES, run_multicore
+from online_scheduler import ALGORITHMS as ONLINE_ALGORITHMS, OnlineScheduler
+from tracing import Tracer
+from workload_generator import disk_workload
+
+
+CLASSIC_REQUESTS = [98, 183, 37, 122, 14, 124, 65, 67]
+CLASSIC_HEAD = 53
+
+
+def random_workloads(seed, count=300, size=8):
+    """Seeded small workloads of (name, arrival, burst, priority), plus a quantum"""
+    rng = random.Random(seed)
+    for _ in range(count):
+        processes = [(f"P{i}", rng.randint(0, 15), rng.randint(1, 8), rng.randint(0, 3))
+                     for i in range(rng.randint(1, size))]
+        yield processes, rng.randint(1, 4)
+
+
+def scheduler_for(processes):
+    scheduler = CPUScheduler()
+    for process in processes:
+        scheduler.add_process(*process)
+    return scheduler
+
+
+def append_segment(chart, name, start, end):
+    # Back-to-back segments of the same process are one bar, as in GanttChart
+    if chart and chart[-1][0] == name and chart[-1][2] == start:
+        chart[-1] = (name, chart[-1][1], end)
+    else:
+        chart.append((name, start, end))
+
+
+def reference_schedule(processes, key, preemptive):
+    """One time unit at a time, run the arrived process with the smallest key.
+
+    ``key(process, remaining)``; ties go to the process added first.
+    Non-preemptive schedules run the chosen process to completion.
+    """
+    remaining = [p[2] for p in processes]
+    chart = []
+    time = 0
+    while any(remaining):
+        available = [i for i, p in enumerate(processes) if p[1] <= time and remaining[i]]
+        if not available:
+            time += 1
+            continue
+        i = min(available, key=lambda i: key(processes[i], remaining[i]))
+        run = 1 if preemptive else remaining[i]
+        append_segment(chart, processes[i][0], time, time + run)
+        remaining[i] -= run
+        time += run
+    return chart
+
+
+def reference_round_robin(processes, quantum):
+    """Round Robin; arrivals during a quantum queue ahead of the preempted process"""
+    order = sorted(range(len(processes)), key=lambda i: processes[i][1])
+    remaining = [p[2] for p in processes]
+    queue = []
+    chart = []
+    time = 0
+
+    def admit(skip=None):
+        for i in order:
+            if processes[i][1] <= time and remaining[i] and i not in queue and i != skip:
+                queue.append(i)
+
+    while any(remaining):
+        admit()
+        if not queue:
+            time += 1
+            continue
+        i = queue.pop(0)
+        run = min(quantum, remaining[i])
+        append_segment(chart, processes[i][0], time, time + run)
+        remaining[i] -= run
+        time += run
+        if remaining[i]:
+            admit(skip=i)
+            queue.append(i)
+    return chart
+
+
+REFERENCES = {
+    'FCFS': lambda processes: reference_schedule(processes, lambda p, left: p[1], False),
+    'SJF': lambda processes: reference_schedule(processes, lambda p, left: p[2], False),
+    'SRTF': lambda processes: reference_schedule(processes, lambda p, left: left, True),
+    'PRIORITY': lambda processes: reference_schedule(processes, lambda p, left: p[3], False),
+    'PRIORITY_P': lambda processes: reference_schedule(processes, lambda p, left: p[3], True),
+}
+
+
+@pytest.mark.parametrize('algorithm', sorted(REFERENCES))
+def test_cpu_matches_reference(algorithm):
+    for processes, _ in random_workloads(1):
+        chart = run_cpu(scheduler_for(processes), algorithm)
+        assert list(chart) == REFERENCES[algorithm](processes), processes
+
+
+def test_round_robin_matches_reference():
+    for processes, quantum in random_workloads(2):
+        chart = scheduler_for(processes).round_robin(quantum)
+        assert list(chart) == reference_round_robin(processes, quantum), (processes, quantum)
+
+
+@pytest.mark.parametrize('algorithm', ONLINE_ALGORITHMS)
+def test_online_matches_batch(algorithm):
+    for processes, quantum in random_workloads(3):
+        processes.sort(key=lambda p: p[1])
+        chart = run_cpu(scheduler_for(processes), algorithm, quantum)
+        events = OnlineScheduler(algorithm, quantum).run(processes)
+        segments = [event[1:] for event in events if event[0] == 'segment']
+        assert segments == list(chart), (processes, quantum)
+
+
+@pytest.mark.parametrize('queues', QUEUE_MODES)
+@pytest.mark.parametrize('algorithm', MULTICORE_ALGORITHMS)
+def test_one_core_matches_single_core(algorithm, queues):
+    for processes, quantum in random_workloads(4, count=150):
+        scheduler = scheduler_for(processes)
+        chart = run_cpu(scheduler, algorithm, quantum)
+        result = run_multicore(scheduler, algorithm, cores=1, time_quantum=quantum, queues=queues)
+        assert list(result['gantt'][0]) == list(chart), (processes, quantum)
+
+
+def reference_sstf(requests, head):
+    """Closest request next; equal distances go to the earlier request"""
+    sequence = [head]
+    pending = list(requests)
+    while pending:
+        closest = min(pending, key=lambda r: abs(r - sequence[-1]))
+        pending.remove(closest)
+        sequence.append(closest)
+    return sequence
+
+
+def test_sstf_matches_reference():
+    rng = random.Random(5)
+    for _ in range(500):
+        size = rng.choice([5, 20, 200])
+        requests = [rng.randrange(size) for _ in range(rng.randint(0, 30))]
+        head = rng.randrange(size)
+        scheduler = DiskScheduler()
+        scheduler.set_requests(requests, head)
+        expected = reference_sstf(requests, head) if requests else []
+        assert scheduler.sstf() == expected, (requests, head)
+
+
+@pytest.mark.parametrize('algorithm, seek', [('sstf', 236), ('scan', 236), ('c_scan', 382),
+                                             ('look', 208), ('c_look', 322), ('fscan', 236)])
+def test_classic_seek_totals(algorithm, seek):
+    scheduler = DiskScheduler()
+    scheduler.set_requests(CLASSIC_REQUESTS, CLASSIC_HEAD)
+    sequence = getattr(scheduler, algorithm)()
+    served = [cylinder for cylinder in sequence[1:] if cylinder in CLASSIC_REQUESTS]
+    assert sorted(served) == sorted(CLASSIC_REQUESTS)
+    assert scheduler.calculate_seek_time(sequence) == seek
+
+
+def test_max_bypassed():
+    # Requests alternate around the head, so each sweep leaves half behind
+    scheduler = DiskScheduler()
+    scheduler.set_requests([10, 190, 20, 180, 30, 170], 100)
+    for algorithm in ('scan', 'c_scan', 'look', 'c_look', 'fscan'):
+        getattr(scheduler, algorithm)()
+        assert scheduler.max_bypassed == 3, algorithm
+    scheduler.n_step_scan(step=2)
+    assert scheduler.max_bypassed == 5
+    scheduler.sstf()
+    assert scheduler.max_bypassed is None
+
+
+def test_negative_switch_cost_is_rejected():
+    with pytest.raises(ValueError):
+        CPUScheduler(switch_cost=-1)
+    scheduler = CPUScheduler()
+    with pytest.raises(ValueError):
+        scheduler.switch_cost = -1
+    assert scheduler.switch_cost == 0
+
+
+def test_seeded_head_start_is_not_the_first_request():
+    starts = [disk_workload(10, seed=seed) for seed in range(20)]
+    assert sum(head == requests[0] for requests, head in starts) <= 1
+    assert disk_workload(10, seed=3) == disk_workload(10, seed=3)
+
+
+@pytest.mark.parametrize('algorithm, boost', [(a, None) for a in IO_CPU_ALGORITHMS]
+                         + [('MLFQ', 5), ('MLFQ', 7)])
+def test_single_burst_io_simulation_matches_cpu_engines(algorithm, boost):
+    for processes, quantum in random_workloads(6):
+        # Priorities double as CFS nice values, so spread them around 0
+        processes = [(name, arrival, burst, 2 * priority - 3)
+                     for name, arrival, burst, priority in processes]
+        scheduler = scheduler_for(processes)
+        if algorithm == 'MLFQ':
+            scheduler.mlfq(3, quantum, boost_interval=boost)
+        else:
+            run_cpu(scheduler, algorithm, quantum)
+        result = simulate_io([(name, arrival, [burst], [], priority)
+                              for name, arrival, burst, priority in processes],
+                             algorithm, time_quantum=quantum, boost_interval=boost)
+        expected = scheduler.processes.column('completion_time').tolist()
+        assert result['completion_time'].tolist() == expected, (processes, quantum)
+
+
+@pytest.mark.parametrize('algorithm', [a for a in TIMED_DISK_ALGORITHMS if a != 'SATF'])
+def test_timed_disk_at_time_zero_matches_static(algorithm):
+    # With every request queued at time 0 the head follows the static sequence
+    rng = random.Random(7)
+    for _ in range(200):
+        size = rng.choice([20, 200])
+        requests = [rng.randrange(size) for _ in range(rng.randint(1, 20))]
+        head = rng.randrange(size)
+        scheduler = DiskScheduler()
+        scheduler.set_requests(requests, head)
+        seek = scheduler.calculate_seek_time(run_disk(scheduler, algorithm, size, 3))
+        result = simulate_disk([0] * len(requests), requests, head, algorithm, head_speed=2.0,
+                               disk_size=size, step=3)
+        assert result['summary']['seek_distance'] == seek, (requests, head)
+        assert result['completion_time'].max() == seek / 2.0
+
+
+def test_timed_disk_only_chooses_among_arrived_requests():
+    # 45 is closer to the head at the start, but has not arrived yet
+    result = simulate_disk([0, 10, 10], [60, 45, 70], head_start=50, algorithm='SSTF',
+                           service_time=1.0)
+    assert result['order'].tolist() == [0, 2, 1]
+    # 60 is served by 11; then 70 (10 away) goes before 45 (15 away)
+    assert result['start_time'].tolist() == [0.0, 22.0, 11.0]
+    assert result['wait_time'].tolist() == [0.0, 12.0, 1.0]
+
+
+def reference_satf(arrivals, cylinders, sectors, head, model):
+    """Serve the arrived request with the shortest access time; ties to the oldest"""
+    pending = []
+    order = []
+    clock = 0.0
+    position = head
+    upcoming = 0
+    while len(order) < len(cylinders):
+        while upcoming < len(cylinders) and arrivals[upcoming] <= clock:
+            pending.append(upcoming)
+            upcoming += 1
+        if not pending:
+            clock = arrivals[upcoming]
+            continue
+        access = {i: model.access_time(clock, position, cylinders[i], sectors[i]) for i in pending}
+        i = min(pending, key=lambda i: (round(access[i], 9), i))
+        pending.remove(i)
+        order.append(i)
+        clock += access[i]
+        position = cylinders[i]
+    return order
+
+
+def test_satf_matches_reference():
+    model = DiskModel()
+    rng = random.Random(8)
+    for _ in range(300):
+        count = rng.randint(1, 15)
+        arrivals = sorted(rng.choice([0.0, rng.uniform(0, 40)]) for _ in range(count))
+        cylinders = [rng.randrange(200) for _ in range(count)]
+        sectors = [rng.randrange(63) for _ in range(count)]
+        head = rng.randrange(200)
+        result = simulate_disk(arrivals, cylinders, head, 'SATF', model=model, sectors=sectors)
+        expected = reference_satf(arrivals, cylinders, sectors, head, model)
+        assert result['order'].tolist() == expected, (arrivals, cylinders, sectors, head)
+
+
+def test_satf_ties_go_to_the_oldest_request():
+    # Equal seeks either side of the head and the same sector: equal access times
+    model = DiskModel()
+    for cylinders in ([120, 80, 120], [80, 120, 80]):
+        result = simulate_disk([0, 0, 0], cylinders, 100, 'SATF', model=model, sectors=[5, 5, 5])
+        assert result['order'][0] == 0
+
+
+def test_one_level_mlfq_is_round_robin():
+    for processes, quantum in random_workloads(9):
+        scheduler = scheduler_for(processes)
+        expected = list(scheduler.round_robin(quantum))
+        assert list(scheduler.mlfq(1, quantum)) == expected, (processes, quantum)
+        assert scheduler.level_stats[0]['cpu_share'] == 1.0
+
+
+def test_mlfq_demotes_and_boosts():
+    scheduler = scheduler_for([('A', 0, 20, 0), ('B', 0, 20, 0)])
+    # Quanta 1, 2, 4: both use up levels 0 and 1, then share level 2
+    assert list(scheduler.mlfq(3, 1))[:6] == [('A', 0, 1), ('B', 1, 2), ('A', 2, 4),
+                                              ('B', 4, 6), ('A', 6, 10), ('B', 10, 14)]
+    # The boost at 10 gives A a fresh level-0 quantum, then B and A go down again
+    assert list(scheduler.mlfq(3, 1, boost_interval=10))[:8] == [
+        ('A', 0, 1), ('B', 1, 2), ('A', 2, 4), ('B', 4, 6),
+        ('A', 6, 11), ('B', 11, 12), ('A', 12, 14), ('B', 14, 16)]
+
+
+def reference_cfs(processes, target_latency=6, min_granularity=1):
+    """CFS for nice-0 processes, checking for arrivals one time unit at a time.
+
+    With equal weights vruntime is the CPU time used, so every value is an
+    exact integer and ties break on the process index.
+    """
+    order = sorted(range(len(processes)), key=lambda i: processes[i][1])
+    remaining = [p[2] for p in processes]
+    ready = []
+    chart = []
+    min_vruntime = 0
+    time = upcoming = 0
+
+    def admit(vruntime):
+        nonlocal upcoming
+        while upcoming < len(order) and processes[order[upcoming]][1] <= time:
+            heapq.heappush(ready, (vruntime, order[upcoming]))
+            upcoming += 1
+
+    while any(remaining):
+        admit(min_vruntime)
+        if not ready:
+            time = processes[order[upcoming]][1]
+            continue
+        vruntime, i = heapq.heappop(ready)
+        runnable = len(ready) + 1
+        period = max(target_latency, runnable * min_granularity)
+        stop = time + min(remaining[i], max(min_granularity, period // runnable))
+        start = time
+        while time + 1 < stop:
+            # Arrivals during the slice start at the smallest vruntime as of then
+            time += 1
+            running = vruntime + time - start
+            min_vruntime = max(min_vruntime, min(running, ready[0][0]) if ready else running)
+            admit(min_vruntime)
+        time = stop
+        append_segment(chart, processes[i][0], start, stop)
+        remaining[i] -= stop - start
+        if remaining[i]:
+            heapq.heappush(ready, (vruntime + stop - start, i))
+        if ready and ready[0][0] > min_vruntime:
+            min_vruntime = ready[0][0]
+    return chart
+
+
+def test_cfs_matches_reference():
+    for processes, _ in random_workloads(10):
+        processes = [(name, arrival, burst, 0) for name, arrival, burst, _ in processes]
+        chart = scheduler_for(processes).cfs()
+        assert list(chart) == reference_cfs(processes), processes
+
+
+def test_cfs_shares_by_weight():
+    # Nice -5 weighs 3121 against 1024 for nice 0: about three times the CPU
+    scheduler = scheduler_for([('A', 0, 100, 0), ('B', 0, 100, -5)])
+    chart = scheduler.cfs()
+    used = {'A': 0, 'B': 0}
+    for name, start, end in chart:
+        if end <= 60:
+            used[name] += end - start
+    assert 2.5 <= used['B'] / used['A'] <= 3.5
+
+
+@pytest.mark.parametrize('algorithm', sorted(REFERENCES) + ['RR'])
+def test_zero_switch_cost_leaves_schedules_unchanged(algorithm):
+    for processes, quantum in random_workloads(11, count=150):
+        scheduler = scheduler_for(processes)
+        scheduler.switch_cost = 0
+        chart = list(run_cpu(scheduler, algorithm, quantum))
+        expected = (reference_round_robin(processes, quantum) if algorithm == 'RR'
+                    else REFERENCES[algorithm](processes))
+        assert chart == expected, (processes, quantum)
+
+
+@pytest.mark.parametrize('algorithm', CPU_ALGORITHMS)
+def test_switch_cost_segments(algorithm):
+    for processes, quantum in random_workloads(12, count=150):
+        scheduler = scheduler_for(processes)
+        scheduler.switch_cost = 2
+        chart = list(run_cpu(scheduler, algorithm, quantum))
+        bursts = {name: burst for name, _, burst, _ in processes}
+        ran = dict.fromkeys(bursts, 0)
+        for before, (name, start, end), after in zip([None] + chart, chart, chart[1:] + [None]):
+            if name == OVERHEAD_NAME:
+                # A switch takes the full cost and sits between two different processes
+                assert end - start == 2 and before[2] <= start and end <= after[1]
+                assert before[0] != after[0] and OVERHEAD_NAME not in (before[0], after[0])
+            else:
+                ran[name] += end - start
+        assert ran == bursts, (processes, quantum)
+        usage = scheduler.calculate_metrics(chart)['_cpu']
+        assert usage['overhead_time'] == 2 * usage['context_switches']
+
+
+@pytest.mark.parametrize('algorithm', CPU_ALGORITHMS)
+def test_tracer_events_add_up_to_the_bursts(algorithm):
+    for processes, quantum in random_workloads(13, count=150):
+        tracer = Tracer()
+        scheduler = scheduler_for(processes)
+        expected = list(run_cpu(scheduler, algorithm, quantum))
+        scheduler.tracer = tracer
+        assert list(run_cpu(scheduler, algorithm, quantum)) == expected
+
+        ran = [0] * len(processes)
+        running = None
+        for _, kind, time, value in tracer.events:
+            if kind == 'dispatch':
+                assert running is None
+                running = (value, time)
+            elif kind in ('preempt', 'complete'):
+                process, start = running
+                assert process == value
+                ran[process] += time - start
+                running = None
+        assert running is None
+        assert ran == [burst for _, _, burst, _ in processes], (processes, quantum)
+        assert tracer.counters['arrive'] == tracer.counters['complete'] == len(processes)
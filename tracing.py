@@ -0,0 +1,115 @@
+import json
+
+EVENTS = ('arrive', 'dispatch', 'preempt', 'complete', 'idle')
+
+
+class Tracer:
+    """Opt-in event sink for the CPUScheduler engines.
+
+    Set ``scheduler.tracer = Tracer()`` and every engine run starts a new
+    run with begin() and reports what it does, in the order it does it:
+
+    - ``arrive``: a process enters the ready set (at its arrival time)
+    - ``dispatch``: a process starts running
+    - ``preempt``: a process leaves the CPU before finishing (quantum or
+      slice expiry, or a better process preempting it)
+    - ``complete``: a process finishes
+    - ``idle``: the CPU has nothing to run; the value is the time it becomes
+      busy again instead of a process index
+
+    Events are kept as ``(run, kind, time, value)`` tuples in ``events``
+    (unless ``keep_events`` is False) and passed to ``listener(kind, time,
+    value)`` if one is given. Every pass of an engine's main loop also
+    samples the ready-set size into ``samples`` as ``(run, time, size)``.
+    ``counters`` holds the loop iterations, the largest ready set and how
+    many events of each kind there were. With no tracer set the engines
+    only pay for an ``is None`` check at each of these points.
+
+    ``prefix`` is put in front of the labels of the runs that follow, e.g.
+    the workload they belong to.
+    """
+
+    def __init__(self, listener=None, keep_events=True):
+        self.listener = listener
+        self.keep_events = keep_events
+        self.prefix = ''
+        self.runs = []
+        self.events = []
+        self.samples = []
+        self.counters = dict.fromkeys(('iterations', 'max_ready') + EVENTS, 0)
+
+    def begin(self, label, names):
+        """Start a new run called ``label`` over processes ``names``"""
+        self.runs.append((self.prefix + label, names))
+
+    def event(self, kind, time, value):
+        self.counters[kind] += 1
+        if self.keep_events:
+            self.events.append((len(self.runs) - 1, kind, time, value))
+        if self.listener is not None:
+            self.listener(kind, time, value)
+
+    def arrive(self, time, process):
+        self.event('arrive', time, process)
+
+    def dispatch(self, time, process):
+        self.event('dispatch', time, process)
+
+    def preempt(self, time, process):
+        self.event('preempt', time, process)
+
+    def complete(self, time, process):
+        self.event('complete', time, process)
+
+    def idle(self, start, end):
+        self.event('idle', start, end)
+
+    def sample(self, time, ready):
+        """Count a loop iteration with ``ready`` processes waiting to run"""
+        counters = self.counters
+        counters['iterations'] += 1
+        if ready > counters['max_ready']:
+            counters['max_ready'] = ready
+        if self.keep_events:
+            self.samples.append((len(self.runs) - 1, time, ready))
+
+    def chrome_trace(self, time_unit_us=1000.0):
+        """The kept events as a Chrome trace-event dict (one trace process per run).
+
+        Running time becomes complete ("X") slices named after the process
+        on a "CPU" track, idle time slices named "idle", arrivals instant
+        events and the ready-set samples a counter. One scheduler time unit
+        lasts ``time_unit_us`` microseconds (a millisecond by default).
+        """
+        trace = []
+        for run, (label, names) in enumerate(self.runs):
+            trace.append({'name': 'process_name', 'ph': 'M', 'pid': run, 'args': {'name': label}})
+            trace.append({'name': 'thread_name', 'ph': 'M', 'pid': run, 'tid': 0,
+                          'args': {'name': 'CPU'}})
+
+        running = {}
+        for run, kind, time, value in self.events:
+            names = self.runs[run][1]
+            if kind == 'dispatch':
+                running[run] = (value, time)
+            elif kind in ('preempt', 'complete'):
+                process, start = running.pop(run)
+                trace.append({'name': names[process], 'ph': 'X', 'pid': run, 'tid': 0,
+                              'ts': start * time_unit_us, 'dur': (time - start) * time_unit_us,
+                              'args': {'until': kind}})
+            elif kind == 'arrive':
+                trace.append({'name': f"arrive {names[value]}", 'ph': 'i', 's': 't',
+                              'pid': run, 'tid': 0, 'ts': time * time_unit_us})
+            elif kind == 'idle':
+                trace.append({'name': 'idle', 'ph': 'X', 'pid': run, 'tid': 0,
+                              'ts': time * time_unit_us, 'dur': (value - time) * time_unit_us})
+
+        for run, time, size in self.samples:
+            trace.append({'name': 'ready', 'ph': 'C', 'pid': run, 'ts': time * time_unit_us,
+                          'args': {'processes': size}})
+        return {'traceEvents': trace, 'displayTimeUnit': 'ms'}
+
+    def write_chrome_trace(self, path, time_unit_us=1000.0):
+        """Write chrome_trace() to ``path`` for chrome://tracing or Perfetto"""
+        with open(path, 'w') as f:
+            json.dump(self.chrome_trace(time_unit_us), f)
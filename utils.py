@@ -1,56 +1,81 @@
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import numpy as np
-import hashlib
+# matplotlib and hashlib are imported on first use so that importing utils
+# (e.g. for InputValidator) stays cheap and display-free.
+import math
+
 
 class PlotUtils:
+    # Fixed colors for the usual process names
+    COLOR_MAP = {
+        'P1': '#1f77b4',  # blue
+        'P2': '#ff7f0e',  # orange
+        'P3': '#2ca02c',  # green
+        'P4': '#d62728',  # red
+        'P5': '#9467bd',  # purple
+        'P6': '#8c564b',  # brown
+        'P7': '#e377c2',  # pink
+        'P8': '#7f7f7f',  # gray
+        'P9': '#bcbd22',  # yellow-green
+        'P10': '#17becf', # cyan
+        'A': '#1f77b4',
+        'B': '#ff7f0e', 
+        'C': '#2ca02c',
+        'D': '#d62728',
+        'E': '#9467bd',
+        'F': '#8c564b',
+        'G': '#e377c2',
+        'H': '#7f7f7f',
+        'I': '#bcbd22',
+        'J': '#17becf',
+        'Context Switch': '#404040'
+    }
+    _color_cache = {}
+    
     @staticmethod
     def get_process_color(process_name):
         """Generate consistent color for each process based on its name"""
-        # Create a color map based on process name hash
-        color_map = {
-            'P1': '#1f77b4',  # blue
-            'P2': '#ff7f0e',  # orange
-            'P3': '#2ca02c',  # green
-            'P4': '#d62728',  # red
-            'P5': '#9467bd',  # purple
-            'P6': '#8c564b',  # brown
-            'P7': '#e377c2',  # pink
-            'P8': '#7f7f7f',  # gray
-            'P9': '#bcbd22',  # yellow-green
-            'P10': '#17becf', # cyan
-            'A': '#1f77b4',
-            'B': '#ff7f0e', 
-            'C': '#2ca02c',
-            'D': '#d62728',
-            'E': '#9467bd',
-            'F': '#8c564b',
-            'G': '#e377c2',
-            'H': '#7f7f7f',
-            'I': '#bcbd22',
-            'J': '#17becf'
-        }
-        
-        if process_name in color_map:
-            return color_map[process_name]
+        color = PlotUtils._color_cache.get(process_name)
+        if color is not None:
+            return color
+        
+        if process_name in PlotUtils.COLOR_MAP:
+            color = PlotUtils.COLOR_MAP[process_name]
         else:
             # Generate consistent color for custom process names
-            hash_obj = hashlib.md5(process_name.encode())
+            import hashlib
+            hash_obj = hashlib.md5(str(process_name).encode())
             hash_num = int(hash_obj.hexdigest()[:8], 16)
-            return f'#{hash_num % 0xffffff:06x}'
+            color = f'#{hash_num % 0xffffff:06x}'
+        PlotUtils._color_cache[process_name] = color
+        return color
     
     @staticmethod
     def create_figure(parent, width=8, height=4):
-        fig, ax = plt.subplots(figsize=(width, height))
+        # A bare Figure avoids pulling in pyplot and its global backend state
+        from matplotlib.figure import Figure
+        fig = Figure(figsize=(width, height))
+        ax = fig.add_subplot()
         fig.patch.set_facecolor('#f0f0f0')
         ax.set_facecolor('#fafafa')
         return fig, ax
     
     @staticmethod
     def draw_cpu_gantt(ax, processes, title="CPU Scheduling Gantt Chart"):
+        """Draw a GanttChart (or list of (name, start, end) tuples) on ``ax``.
+
+        A list of GanttCharts, one per core, is drawn with one lane per core
+        instead of one row per process. Context-switch overhead gets a row
+        of its own.
+
+        All bars go into one PolyCollection managed by a GanttRenderer, which
+        redraws only the visible time window whenever the x-limits change.
+        """
         ax.clear()
         
-        if not processes:
+        from gantt import GanttChart
+        
+        per_core = (isinstance(processes, (list, tuple)) and processes
+                    and isinstance(processes[0], GanttChart))
+        if not any(processes) if per_core else not processes:
             ax.text(0.5, 0.5, 'No processes to display', 
                    ha='center', va='center', transform=ax.transAxes, fontsize=12)
             ax.set_xlim(0, 1)
@@ -58,96 +83,397 @@ class PlotUtils:
             ax.set_title(title)
             return
         
-        # Create multiple rows for better visualization
-        process_rows = {}
-        current_row = 0
+        from matplotlib.patches import Patch
+        import numpy as np
+        
+        if per_core:
+            PlotUtils._draw_core_lanes(ax, processes, title)
+            return
+        if not isinstance(processes, GanttChart):
+            processes = GanttChart.from_segments(processes)
+        process = processes.process
         
-        for i, (name, start, end) in enumerate(processes):
-            if name not in process_rows:
-                process_rows[name] = current_row
-                current_row += 1
+        # One row per process name, in order of first appearance; the spare
+        # last slot of index_rows is where OVERHEAD (-1) lands
+        indices, first_seen = np.unique(process, return_index=True)
+        process_rows = {}
+        index_rows = np.zeros(int(indices[-1]) + 2, dtype=np.int64)
+        for i in indices[np.argsort(first_seen)].tolist():
+            index_rows[i] = process_rows.setdefault(processes.label(i), len(process_rows))
+        row_names = list(process_rows)
         
         # Calculate bar height based on number of processes
-        bar_height = 0.6 / max(1, len(process_rows))
-        
-        # Create a set to track which processes we've already added to legend
-        legend_added = set()
-        legend_handles = []
-        legend_labels = []
-        
-        for i, (name, start, end) in enumerate(processes):
-            row = process_rows[name]
-            color = PlotUtils.get_process_color(name)
-            
-            # Draw the main bar
-            bar = ax.barh(row, end-start, left=start, height=bar_height, color=color, 
-                         edgecolor='black', alpha=0.8)
-            
-            # Add process name in the middle of the bar
-            ax.text((start + end)/2, row, name, ha='center', va='center', 
-                   fontweight='bold', fontsize=9, color='white')
-            
-            # Add time labels
-            ax.text(start, row + bar_height/2 + 0.1, f'{start}', 
-                   ha='center', va='bottom', fontsize=8)
-            ax.text(end, row + bar_height/2 + 0.1, f'{end}', 
-                   ha='center', va='bottom', fontsize=8)
-            
-            # Add to legend if not already added
-            if name not in legend_added:
-                legend_handles.append(bar[0])
-                legend_labels.append(name)
-                legend_added.add(name)
+        bar_height = max(0.6 / max(1, len(process_rows)), 0.1)
+        
+        span = max(1, int(processes.end.max()) - int(processes.start[0]))
+        ax.set_ylim(-0.5, len(row_names) - 0.5)
+        ax.set_xlim(int(processes.start[0]) - 0.02 * span,
+                    int(processes.end.max()) + 0.02 * span)
+        
+        segment_rows = index_rows[process]
+        renderer = GanttRenderer(ax, [(processes, segment_rows, segment_rows)], row_names,
+                                 bar_height)
+        # The axes callback registry only keeps a weak reference
+        ax.gantt_renderer = renderer
         
         ax.set_xlabel('Time')
         ax.set_ylabel('Processes')
-        ax.set_yticks(list(process_rows.values()))
-        ax.set_yticklabels(list(process_rows.keys()))
+        if len(row_names) <= GanttRenderer.MAX_TICK_ROWS:
+            ax.set_yticks(range(len(row_names)))
+            ax.set_yticklabels(row_names)
         ax.set_title(title)
         ax.grid(True, alpha=0.3, axis='x')
         
         # Add legend with all processes
-        if legend_handles:
-            ax.legend(legend_handles, legend_labels, 
+        if len(row_names) <= GanttRenderer.MAX_LEGEND_ROWS:
+            legend_handles = [Patch(facecolor=color, edgecolor='black', alpha=0.8)
+                              for color in renderer.label_colors]
+            ax.legend(legend_handles, row_names, 
+                     bbox_to_anchor=(1.05, 1), loc='upper left',
+                     title="Processes")
+        
+        renderer.render()
+    
+    @staticmethod
+    def _draw_core_lanes(ax, charts, title):
+        """One lane per core; bars are colored and labelled by process"""
+        from matplotlib.patches import Patch
+        import numpy as np
+        
+        # Charts from one run share their names list; label processes in order of first use
+        names = charts[0].names
+        used = np.unique(np.concatenate([chart.process for chart in charts]))
+        label_of = np.zeros(int(used[-1]) + 1, dtype=np.int64)
+        label_of[used] = np.arange(len(used))
+        label_names = [names[i] for i in used.tolist()]
+        
+        lanes = []
+        for core, chart in enumerate(charts):
+            lanes.append((chart, np.full(len(chart), core), label_of[chart.process]))
+        
+        busy = [chart for chart in charts if len(chart)]
+        first = min(int(chart.start[0]) for chart in busy)
+        last = max(int(chart.end[-1]) for chart in busy)
+        span = max(1, last - first)
+        ax.set_ylim(-0.5, len(charts) - 0.5)
+        ax.set_xlim(first - 0.02 * span, last + 0.02 * span)
+        
+        renderer = GanttRenderer(ax, lanes, label_names, bar_height=0.6)
+        ax.gantt_renderer = renderer
+        
+        ax.set_xlabel('Time')
+        ax.set_ylabel('Cores')
+        if len(charts) <= GanttRenderer.MAX_TICK_ROWS:
+            ax.set_yticks(range(len(charts)))
+            ax.set_yticklabels([f"CPU {core}" for core in range(len(charts))])
+        ax.set_title(title)
+        ax.grid(True, alpha=0.3, axis='x')
+        
+        if len(label_names) <= GanttRenderer.MAX_LEGEND_ROWS:
+            legend_handles = [Patch(facecolor=color, edgecolor='black', alpha=0.8)
+                              for color in renderer.label_colors]
+            ax.legend(legend_handles, label_names,
                      bbox_to_anchor=(1.05, 1), loc='upper left',
                      title="Processes")
+        
+        renderer.render()
     
     @staticmethod
     def draw_disk_sequence(ax, requests, head_start, title="Disk Scheduling"):
+        """Draw the head path for ``requests`` (a list or NumPy array).
+
+        The path is a single LineCollection managed by a DiskPathRenderer,
+        which decimates it to a min/max envelope when zoomed out and only
+        adds markers and annotations when few points are visible.
+        """
         ax.clear()
         
-        if not requests:
+        if len(requests) == 0:
             ax.text(0.5, 0.5, 'No disk requests to display', 
                    ha='center', va='center', transform=ax.transAxes, fontsize=12)
             ax.set_xlim(0, 1)
             ax.set_ylim(0, 1)
             ax.set_title(title)
             return
-            
+        
+        import numpy as np
+        
         # Plot head movement
-        x_points = list(range(len(requests) + 1))
-        y_points = [head_start] + requests
+        y_points = np.concatenate(([head_start], np.asarray(requests)))
+        last = int(y_points[-1])
         
-        ax.plot(x_points, y_points, 'bo-', linewidth=2, 
-               markersize=8, label='Head Movement', alpha=0.7)
+        steps = len(y_points) - 1
+        ax.set_xlim(-0.05 * max(steps, 1), steps + 0.05 * max(steps, 1))
+        low, high = int(y_points.min()), int(y_points.max())
+        margin = max(1, 0.08 * (high - low))
+        ax.set_ylim(low - margin, high + margin)
+        
+        renderer = DiskPathRenderer(ax, y_points)
+        # The axes callback registry only keeps a weak reference
+        ax.disk_renderer = renderer
         
         # Mark start and end points
         ax.plot(0, head_start, 'go', markersize=10, label=f'Start ({head_start})')
-        ax.plot(len(requests), requests[-1], 'ro', markersize=10, 
-               label=f'End ({requests[-1]})')
+        ax.plot(steps, last, 'ro', markersize=10, 
+               label=f'End ({last})')
         
         ax.set_xlabel('Step')
         ax.set_ylabel('Cylinder Number')
         ax.set_title(title)
         ax.legend()
         ax.grid(True, alpha=0.3)
-        
+        renderer.render()
+
+class GanttRenderer:
+    """Level-of-detail renderer behind PlotUtils.draw_cpu_gantt.
+
+    ``lanes`` is a list of ``(chart, rows, labels)``: a GanttChart plus, per
+    segment, the row it is drawn on and its index into ``label_names``,
+    which sets the bar's color and text. Only segments inside the current
+    x-limits are turned into bars, all in a single PolyCollection. When
+    there are more bars than pixel columns, bars on the same row that are
+    less than a pixel apart are merged, and rows that share a pixel row
+    count as one. If the bars still outnumber the pixel columns, or there
+    are more rows than pixel rows, they are painted into one image of
+    pixel cells instead. Text labels are only added when few enough bars
+    are wide enough to hold them. The renderer hooks ``xlim_changed`` and
+    ``ylim_changed``, so zooming and panning rebuild just the visible
+    window.
+    """
+
+    LABEL_MIN_PIXELS = 24
+    MAX_LABELS = 150
+    MAX_EDGED_BARS = 2000
+    MAX_TICK_ROWS = 50
+    MAX_LEGEND_ROWS = 30
+
+    def __init__(self, ax, lanes, label_names, bar_height):
+        from matplotlib.collections import PolyCollection
+        from matplotlib.image import AxesImage
+        import numpy as np
+
+        self.ax = ax
+        self.lanes = lanes
+        self.label_names = label_names
+        self.bar_height = bar_height
+        # get_process_color always returns '#rrggbb', so decode them in one go
+        hex_colors = ''.join(PlotUtils.get_process_color(name)[1:] for name in label_names)
+        rgb = np.frombuffer(bytes.fromhex(hex_colors), dtype=np.uint8).reshape(-1, 3)
+        self.label_colors = np.ones((len(label_names), 4))
+        self.label_colors[:, :3] = rgb / 255
+        self.collection = PolyCollection([], alpha=0.8)
+        ax.add_collection(self.collection, autolim=False)
+        # Pixel cells for dense views; the extra last color is transparent
+        self.cell_colors = np.vstack((self.label_colors, np.zeros(4)))
+        self.cell_colors[:-1, 3] = 0.8
+        self.image = AxesImage(ax, interpolation='nearest', origin='lower')
+        self.image.set_visible(False)
+        ax.add_image(self.image)
+        self.labels = []
+        ax.callbacks.connect('xlim_changed', self._on_limits_changed)
+        ax.callbacks.connect('ylim_changed', self._on_limits_changed)
+
+    def _on_limits_changed(self, ax):
+        self.render()
+
+    def rows_per_pixel(self):
+        """How many rows share one pixel row at the current y-limits (at least 1)"""
+        y0, y1 = self.ax.get_ylim()
+        return max(1, math.ceil(abs(y1 - y0) / max(1.0, self.ax.bbox.height)))
+
+    def visible_bars(self):
+        """(starts, ends, rows, labels) of the bars to draw for the current x-limits"""
+        import numpy as np
+
+        x0, x1 = self.ax.get_xlim()
+        windows = []
+        for chart, rows, labels in self.lanes:
+            first = int(np.searchsorted(chart.end, x0, side='right'))
+            last = max(first, int(np.searchsorted(chart.start, x1, side='left')))
+            windows.append((chart.start[first:last], chart.end[first:last],
+                            rows[first:last], labels[first:last]))
+        if len(windows) == 1:
+            starts, ends, rows, labels = windows[0]
+        else:
+            starts, ends, rows, labels = (np.concatenate(column) for column in zip(*windows))
+
+        pixels = max(1.0, self.ax.bbox.width)
+        if len(starts) > pixels:
+            # Dense: merge bars on the same pixel row that are under a pixel apart
+            time_per_pixel = (x1 - x0) / pixels
+            bands = rows // self.rows_per_pixel()
+            order = np.lexsort((starts, bands))
+            starts, ends, rows, labels = starts[order], ends[order], rows[order], labels[order]
+            bands = bands[order]
+            # Bars of different rows in a band overlap, so compare against the
+            # furthest end so far, restarted at each band by an offset
+            offset = (bands - bands[0]) * (int(ends.max()) - int(starts.min()) + 1)
+            reach = np.maximum.accumulate(ends + offset) - offset
+            new_bar = np.ones(len(starts), dtype=bool)
+            new_bar[1:] = (bands[1:] != bands[:-1]) | (starts[1:] - reach[:-1] > time_per_pixel)
+            groups = np.flatnonzero(new_bar)
+            starts = starts[groups]
+            ends = np.maximum.reduceat(ends, groups)
+            rows = rows[groups]
+            labels = labels[groups]
+        return starts, ends, rows, labels
+
+    def draw_cells(self, starts, ends, rows, label_ids):
+        """Paint the bars into an image with one cell per pixel column and pixel row.
+
+        Each cell takes the color of the last bar painted into it. Rows are
+        grouped into bands of rows_per_pixel() rows, and only the bands
+        inside the y-limits get cells.
+        """
+        import numpy as np
+
+        x0, x1 = self.ax.get_xlim()
+        y0, y1 = sorted(self.ax.get_ylim())
+        width = max(1, int(self.ax.bbox.width))
+        per_band = self.rows_per_pixel()
+        first = max(0, math.floor((y0 + 0.5) / per_band))
+        last = max(first, math.floor((y1 + 0.5) / per_band))
+        bands = rows // per_band
+        shown = (bands >= first) & (bands <= last)
+        bands, label_ids = bands[shown] - first, label_ids[shown]
+
+        time_per_pixel = (x1 - x0) / width
+        left = np.clip((starts[shown] - x0) // time_per_pixel, 0, width - 1).astype(np.int64)
+        right = np.ceil((ends[shown] - x0) / time_per_pixel).astype(np.int64) - 1
+        right = np.clip(right, left, width - 1)
+        lengths = right - left + 1
+        offsets = np.arange(int(lengths.sum())) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        cells = np.full((last - first + 1, width), len(self.label_colors))
+        cells[np.repeat(bands, lengths), np.repeat(left, lengths) + offsets] = \
+            np.repeat(label_ids, lengths)
+
+        self.collection.set_verts([])
+        self.image.set_data(self.cell_colors[cells])
+        self.image.set_extent((x0, x1, first * per_band - 0.5, (last + 1) * per_band - 0.5))
+        self.image.set_visible(True)
+
+    def render(self):
+        import numpy as np
+
+        for label in self.labels:
+            label.remove()
+        self.labels = []
+
+        starts, ends, rows, label_ids = self.visible_bars()
+        if len(starts) > max(1.0, self.ax.bbox.width) or self.rows_per_pixel() > 1:
+            self.draw_cells(starts, ends, rows, label_ids)
+            return
+        self.image.set_visible(False)
+        half = self.bar_height / 2
+        verts = np.empty((len(starts), 4, 2))
+        verts[:, 0, 0] = verts[:, 1, 0] = starts
+        verts[:, 2, 0] = verts[:, 3, 0] = ends
+        verts[:, 0, 1] = verts[:, 3, 1] = rows - half
+        verts[:, 1, 1] = verts[:, 2, 1] = rows + half
+        self.collection.set_verts(verts)
+        self.collection.set_facecolor(self.label_colors[label_ids])
+        if len(starts) <= self.MAX_EDGED_BARS:
+            self.collection.set_edgecolor('black')
+        else:
+            self.collection.set_edgecolor('none')
+
+        # Only label bars that are wide enough on screen, and not too many
+        x0, x1 = self.ax.get_xlim()
+        pixels_per_time = max(1.0, self.ax.bbox.width) / max(x1 - x0, 1e-9)
+        wide = np.flatnonzero((ends - starts) * pixels_per_time >= self.LABEL_MIN_PIXELS)
+        if len(wide) > self.MAX_LABELS:
+            return
+        ax = self.ax
+        for start, end, row, label_id in zip(starts[wide].tolist(), ends[wide].tolist(),
+                                          rows[wide].tolist(), label_ids[wide].tolist()):
+            self.labels.append(ax.text((start + end)/2, row, self.label_names[label_id],
+                                       ha='center', va='center', fontweight='bold',
+                                       fontsize=9, color='white'))
+            self.labels.append(ax.text(start, row + half + 0.1, f'{start}',
+                                       ha='center', va='bottom', fontsize=8))
+            self.labels.append(ax.text(end, row + half + 0.1, f'{end}',
+                                       ha='center', va='bottom', fontsize=8))
+
+class DiskPathRenderer:
+    """Level-of-detail renderer behind PlotUtils.draw_disk_sequence.
+
+    The head path is one LineCollection holding only the steps inside the
+    current x-limits. When there are more steps than pixels, each pixel
+    column is reduced to its minimum and maximum cylinder in visiting order,
+    so seek extremes survive decimation. Markers and the per-point
+    annotations only appear once few enough points are visible. Re-renders
+    on every x-limit change.
+    """
+
+    MAX_MARKER_POINTS = 500
+    MAX_ANNOTATED_POINTS = 50
+
+    def __init__(self, ax, y_points):
+        from matplotlib.collections import LineCollection
+
+        self.ax = ax
+        self.y_points = y_points
+        self.path = LineCollection([], colors='b', linewidths=2, alpha=0.7,
+                                   label='Head Movement')
+        ax.add_collection(self.path, autolim=False)
+        self.markers, = ax.plot([], [], 'bo', markersize=8, alpha=0.7)
+        self.annotations = []
+        ax.callbacks.connect('xlim_changed', self._on_xlim_changed)
+
+    def _on_xlim_changed(self, ax):
+        self.render()
+
+    def visible_points(self):
+        """(x, y) arrays of the path points to draw for the current x-limits"""
+        import numpy as np
+
+        x0, x1 = self.ax.get_xlim()
+        n = len(self.y_points)
+        # One extra point on each side so the path runs off the edges
+        first = min(n, max(0, int(np.floor(x0)) - 1))
+        last = max(first, min(n, int(np.ceil(x1)) + 2))
+        y = self.y_points[first:last]
+        x = np.arange(first, last)
+
+        buckets = int(max(1.0, self.ax.bbox.width))
+        if len(y) <= 2 * buckets:
+            return x, y
+
+        # Min/max envelope: keep each bucket's extremes in the order visited
+        size = -(-len(y) // buckets)
+        full = len(y) // size * size
+        blocks = y[:full].reshape(-1, size)
+        offsets = np.arange(0, full, size)
+        lo = offsets + blocks.argmin(axis=1)
+        hi = offsets + blocks.argmax(axis=1)
+        keep = np.sort(np.concatenate((lo, hi, np.arange(full, len(y)))))
+        return x[keep], y[keep]
+
+    def render(self):
+        import numpy as np
+
+        for annotation in self.annotations:
+            annotation.remove()
+        self.annotations = []
+
+        x, y = self.visible_points()
+        self.path.set_segments([np.column_stack((x, y))])
+        if len(x) <= self.MAX_MARKER_POINTS:
+            self.markers.set_data(x, y)
+        else:
+            self.markers.set_data([], [])
+
+        if len(x) > self.MAX_ANNOTATED_POINTS:
+            return
+        ax = self.ax
         # Add step numbers and values
-        for i, (x, y) in enumerate(zip(x_points, y_points)):
-            ax.annotate(f'{y}', (x, y), textcoords="offset points", 
-                       xytext=(0,10), ha='center', fontsize=8)
-            ax.annotate(f'Step {i}', (x, y), textcoords="offset points", 
-                       xytext=(0,-15), ha='center', fontsize=7, color='gray')
+        for step, cylinder in zip(x.tolist(), y.tolist()):
+            self.annotations.append(ax.annotate(f'{cylinder}', (step, cylinder),
+                                                textcoords="offset points", xytext=(0,10),
+                                                ha='center', fontsize=8))
+            self.annotations.append(ax.annotate(f'Step {step}', (step, cylinder),
+                                                textcoords="offset points", xytext=(0,-15),
+                                                ha='center', fontsize=7, color='gray'))
 
 class InputValidator:
     @staticmethod
@@ -0,0 +1,219 @@
+"""Seedable, streaming synthetic workloads for the CPU and disk schedulers.
+
+Everything is produced in fixed-size NumPy chunks, so generating 10^7 items
+only ever holds one chunk in memory. The ``iter_*`` functions flatten the
+chunks into the tuples/ints the schedulers take, and the chunk functions
+can be fed straight to ``CPUScheduler.add_processes``.
+
+    python workload_generator.py cpu -n 1000000 --seed 7 -o jobs.txt
+    python workload_generator.py disk -n 100000 --pattern zipf -o trace.txt
+"""
+import argparse
+import sys
+
+import numpy as np
+
+ARRIVAL_MODELS = ('poisson', 'bursty')
+BURST_MODELS = ('exponential', 'pareto', 'bimodal')
+DISK_PATTERNS = ('uniform', 'zipf', 'sequential')
+
+CHUNK_SIZE = 65536
+
+
+def _chunk_sizes(count, chunk_size):
+    while count > 0:
+        size = min(count, chunk_size)
+        yield size
+        count -= size
+
+
+def _interarrival_gaps(rng, size, model, rate, burstiness, cluster_size):
+    if model == 'poisson':
+        return rng.exponential(1.0 / rate, size)
+    if model == 'bursty':
+        # Arrivals come in clusters (geometric size, mean cluster_size) with
+        # short gaps inside a cluster and long gaps between clusters, chosen
+        # so the overall rate is still ``rate``.
+        new_cluster = 1.0 / cluster_size
+        short_gap = 1.0 / (rate * burstiness)
+        long_gap = (1.0 / rate - (1 - new_cluster) * short_gap) / new_cluster
+        starts = rng.random(size) < new_cluster
+        return rng.exponential(1.0, size) * np.where(starts, long_gap, short_gap)
+    raise ValueError(f"Unknown arrival model: {model}")
+
+
+def _burst_times(rng, size, model, mean_burst, pareto_shape, long_burst, long_fraction):
+    if model == 'exponential':
+        bursts = rng.exponential(mean_burst, size)
+    elif model == 'pareto':
+        # Scale chosen so the mean is mean_burst (needs shape > 1)
+        scale = mean_burst * (pareto_shape - 1) / pareto_shape
+        bursts = (rng.pareto(pareto_shape, size) + 1) * scale
+    elif model == 'bimodal':
+        long = rng.random(size) < long_fraction
+        bursts = rng.exponential(1.0, size) * np.where(long, long_burst, mean_burst)
+    else:
+        raise ValueError(f"Unknown burst model: {model}")
+    return np.maximum(1, np.rint(bursts)).astype(np.int64)
+
+
+def process_chunks(count, seed=None, arrival='poisson', rate=0.1, burstiness=10.0,
+                   cluster_size=8.0, burst='exponential', mean_burst=10.0, pareto_shape=1.5,
+                   long_burst=200.0, long_fraction=0.1, priority_levels=5,
+                   priority_weights=None, start_index=1, chunk_size=CHUNK_SIZE):
+    """Yield ``(first_index, arrival, burst, priority)`` int64 array chunks.
+
+    Arrivals are integer times from Poisson or bursty (clustered) inter-arrival
+    gaps at ``rate`` processes per time unit. Bursts are exponential, Pareto or
+    bimodal (``long_fraction`` of jobs have mean ``long_burst``) and at least 1.
+    Priorities are drawn from ``range(priority_levels)``, uniformly or with
+    ``priority_weights``. ``first_index`` numbers the processes for naming.
+    """
+    if arrival not in ARRIVAL_MODELS:
+        raise ValueError(f"Unknown arrival model: {arrival}")
+    if burst not in BURST_MODELS:
+        raise ValueError(f"Unknown burst model: {burst}")
+    if arrival == 'bursty' and (burstiness < 1 or cluster_size < 1):
+        raise ValueError("burstiness and cluster_size must be at least 1")
+    if burst == 'pareto' and pareto_shape <= 1:
+        raise ValueError("pareto_shape must be > 1 for a finite mean burst")
+
+    rng = np.random.default_rng(seed)
+    if priority_weights is not None:
+        priority_weights = np.asarray(priority_weights, dtype=float)
+        priority_weights = priority_weights / priority_weights.sum()
+        priority_levels = len(priority_weights)
+
+    clock = 0.0
+    index = start_index
+    for size in _chunk_sizes(count, chunk_size):
+        times = clock + np.cumsum(_interarrival_gaps(rng, size, arrival, rate,
+                                                     burstiness, cluster_size))
+        clock = times[-1]
+        bursts = _burst_times(rng, size, burst, mean_burst, pareto_shape,
+                              long_burst, long_fraction)
+        priorities = rng.choice(priority_levels, size, p=priority_weights).astype(np.int64)
+        yield index, np.floor(times).astype(np.int64), bursts, priorities
+        index += size
+
+
+def iter_processes(count, name_prefix='P', **kwargs):
+    """Yield ``(name, arrival, burst, priority)`` tuples, as add_process takes them.
+
+    Accepts the same keyword arguments as process_chunks.
+    """
+    for first, arrivals, bursts, priorities in process_chunks(count, **kwargs):
+        for i, row in enumerate(zip(arrivals.tolist(), bursts.tolist(), priorities.tolist()),
+                                first):
+            yield (f"{name_prefix}{i}",) + row
+
+
+def load_processes(scheduler, count, name_prefix='P', **kwargs):
+    """Bulk-load a generated workload into a CPUScheduler chunk by chunk"""
+    for first, arrivals, bursts, priorities in process_chunks(count, **kwargs):
+        names = [f"{name_prefix}{i}" for i in range(first, first + len(arrivals))]
+        scheduler.add_processes(names, arrivals, bursts, priorities)
+    return scheduler
+
+
+def disk_request_chunks(count, disk_size=200, pattern='uniform', seed=None,
+                        zipf_exponent=1.2, mean_run=16.0, chunk_size=CHUNK_SIZE):
+    """Yield int64 arrays of cylinder requests in ``[0, disk_size)``.
+
+    ``uniform`` spreads requests over the whole disk, ``zipf`` concentrates
+    them on a few hot cylinders (rank r has weight r**-zipf_exponent), and
+    ``sequential`` produces runs of consecutive cylinders with geometric
+    length of mean ``mean_run``.
+    """
+    if pattern not in DISK_PATTERNS:
+        raise ValueError(f"Unknown disk pattern: {pattern}")
+    rng = np.random.default_rng(seed)
+    # Which cylinders are hot is random too, not just the low numbers
+    hot_cylinders = rng.permutation(disk_size) if pattern == 'zipf' else None
+    run_position = None
+
+    for size in _chunk_sizes(count, chunk_size):
+        if pattern == 'uniform':
+            yield rng.integers(0, disk_size, size)
+        elif pattern == 'zipf':
+            ranks = rng.zipf(zipf_exponent, size)
+            yield hot_cylinders[(ranks - 1) % disk_size]
+        else:
+            index = np.arange(size)
+            new_run = rng.random(size) < 1.0 / mean_run
+            if run_position is None:
+                new_run[0] = True
+            starts = rng.integers(0, disk_size, size)
+            run_start = np.maximum.accumulate(np.where(new_run, index, -1))
+            # Requests before the first new run continue the previous chunk's run
+            continued = run_start < 0
+            previous = run_position + 1 if run_position is not None else 0
+            base = np.where(continued, previous, starts[np.maximum(run_start, 0)])
+            offset = index - np.where(continued, 0, run_start)
+            cylinders = (base + offset) % disk_size
+            run_position = int(cylinders[-1])
+            yield cylinders
+
+
+def iter_disk_requests(count, **kwargs):
+    """Yield cylinder requests one at a time (see disk_request_chunks)"""
+    for chunk in disk_request_chunks(count, **kwargs):
+        yield from chunk.tolist()
+
+
+def disk_workload(count, disk_size=200, head_start=None, seed=None, **kwargs):
+    """Return ``(requests, head_start)`` ready for DiskScheduler.set_requests"""
+    if head_start is None:
+        # Drawn from a child of the seed: the requests use the seed itself,
+        # so the same stream would put the head on the first request
+        child = np.random.SeedSequence(seed).spawn(1)[0]
+        head_start = int(np.random.default_rng(child).integers(0, disk_size))
+    requests = list(iter_disk_requests(count, disk_size=disk_size, seed=seed, **kwargs))
+    return requests, head_start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic scheduler workloads.")
+    sub = parser.add_subparsers(dest='mode', required=True)
+
+    cpu = sub.add_parser('cpu', help="processes in the Quick Import format")
+    cpu.add_argument('--arrival', choices=ARRIVAL_MODELS, default='poisson')
+    cpu.add_argument('--rate', type=float, default=0.1, help="arrivals per time unit")
+    cpu.add_argument('--burst', choices=BURST_MODELS, default='exponential')
+    cpu.add_argument('--mean-burst', type=float, default=10.0)
+    cpu.add_argument('--priority-levels', type=int, default=5)
+
+    disk = sub.add_parser('disk', help="cylinder requests, one per line")
+    disk.add_argument('--pattern', choices=DISK_PATTERNS, default='uniform')
+    disk.add_argument('--disk-size', type=int, default=200)
+
+    for p in (cpu, disk):
+        p.add_argument('-n', '--count', type=lambda v: int(float(v)), default=1000)
+        p.add_argument('--seed', type=int, default=None)
+        p.add_argument('-o', '--output', help="output file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    out = open(args.output, 'w') if args.output else sys.stdout
+    try:
+        if args.mode == 'cpu':
+            chunks = process_chunks(args.count, seed=args.seed, arrival=args.arrival,
+                                    rate=args.rate, burst=args.burst,
+                                    mean_burst=args.mean_burst,
+                                    priority_levels=args.priority_levels)
+            for first, arrivals, bursts, priorities in chunks:
+                out.writelines(f"P{i} {a} {b} {p}\n" for i, a, b, p in
+                               zip(range(first, first + len(arrivals)), arrivals.tolist(),
+                                   bursts.tolist(), priorities.tolist()))
+        else:
+            for chunk in disk_request_chunks(args.count, disk_size=args.disk_size,
+                                             pattern=args.pattern, seed=args.seed):
+                out.write('\n'.join(map(str, chunk.tolist())))
+                out.write('\n')
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())